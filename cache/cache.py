@@ -2,7 +2,7 @@ from .policies import ReplacementPolicy
 from utils.logger import Logger, LogLevel
 from colorama import Fore, Style
 import random
-from time import time
+from time import perf_counter
 
 class DEBUG:
     ENABLED = True  # Enable cache debug messages
@@ -50,6 +50,31 @@ class Cache:
         self._data_flow = []
         self._last_access_time = 0
         self._object_size = 32  # Size of Python objects in bytes
+        self._changed_sets = set()  # Sets whose contents changed since last collect_changes()
+        self._version = 0  # Bumped whenever any set's contents change
+        self._state_cache = None  # (version, get_cache_state() result)
+        self._blocks_cache = None  # (version, get_cache_blocks() result)
+
+    @property
+    def num_sets(self):
+        return self._sets
+
+    @property
+    def associativity(self):
+        return self._associativity
+
+    @property
+    def next_level(self):
+        return self._next_level
+
+    def get_set_index(self, address):
+        """Get the set an address maps to, without the debug logging of _calculate_cache_indices"""
+        offset_bits = (self._line_size - 1).bit_length()
+        return (address >> offset_bits) & ((1 << (self._sets - 1).bit_length()) - 1)
+
+    def get_tag(self, address):
+        """Get an address's tag, without the debug logging of _calculate_cache_indices"""
+        return address >> ((self._line_size - 1).bit_length() + (self._sets - 1).bit_length())
 
     def set_next_level(self, next_level):
         """Set the next level in the memory hierarchy"""
@@ -77,24 +102,26 @@ class Cache:
         tag = address >> (offset_bits + index_bits)
 
         # Debug output
-        self._logger.log(LogLevel.DEBUG, f"\nAddress Breakdown for {self._name}:")
-        self._logger.log(LogLevel.DEBUG, f"Address: {address} (0x{address:x})")
-        self._logger.log(LogLevel.DEBUG, f"Line Size: {self._line_size} (offset bits: {offset_bits})")
-        self._logger.log(LogLevel.DEBUG, f"Sets: {self._sets} (index bits: {index_bits})")
-        self._logger.log(LogLevel.DEBUG, f"Offset: {offset} (0x{offset:x})")
-        self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index} (0x{set_index:x})")
-        self._logger.log(LogLevel.DEBUG, f"Tag: {tag} (0x{tag:x})")
+        if self._logger.should_log(LogLevel.DEBUG):
+            self._logger.log(LogLevel.DEBUG, f"\nAddress Breakdown for {self._name}:")
+            self._logger.log(LogLevel.DEBUG, f"Address: {address} (0x{address:x})")
+            self._logger.log(LogLevel.DEBUG, f"Line Size: {self._line_size} (offset bits: {offset_bits})")
+            self._logger.log(LogLevel.DEBUG, f"Sets: {self._sets} (index bits: {index_bits})")
+            self._logger.log(LogLevel.DEBUG, f"Offset: {offset} (0x{offset:x})")
+            self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index} (0x{set_index:x})")
+            self._logger.log(LogLevel.DEBUG, f"Tag: {tag} (0x{tag:x})")
 
         return set_index, tag
 
     def read(self, address, output=True):
         """Read data from cache"""
-        start_time = time()
+        start_time = perf_counter()
 
         # Debug log for every read attempt
-        self._logger.log(LogLevel.DEBUG, f"\n=== Cache Read Operation ===")
-        self._logger.log(LogLevel.DEBUG, f"Address: {address}")
-        self._logger.log(LogLevel.DEBUG, f"Current Stats - Hits: {self._stats['hits']}, Misses: {self._stats['misses']}")
+        if self._logger.should_log(LogLevel.DEBUG):
+            self._logger.log(LogLevel.DEBUG, f"\n=== Cache Read Operation ===")
+            self._logger.log(LogLevel.DEBUG, f"Address: {address}")
+            self._logger.log(LogLevel.DEBUG, f"Current Stats - Hits: {self._stats['hits']}, Misses: {self._stats['misses']}")
 
         # Track data flow
         self._data_flow.append({
@@ -106,8 +133,9 @@ class Cache:
         # Calculate set index and tag using bit masking
         set_index, tag = self._calculate_cache_indices(address)
 
-        self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index}, Tag: {tag}")
-        self._logger.log(LogLevel.DEBUG, f"Current Set Contents: {self._entries[set_index]}")
+        if self._logger.should_log(LogLevel.DEBUG):
+            self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index}, Tag: {tag}")
+            self._logger.log(LogLevel.DEBUG, f"Current Set Contents: {self._entries[set_index]}")
 
         # Check for hit
         for entry in self._entries[set_index]:
@@ -117,7 +145,8 @@ class Cache:
                 self._stats['reads'] += 1
                 value = int(entry["data"])
 
-                self._logger.log(LogLevel.DEBUG, f"Cache HIT - Value: {value}")
+                if self._logger.should_log(LogLevel.DEBUG):
+                    self._logger.log(LogLevel.DEBUG, f"Cache HIT - Value: {value}")
 
                 # Log the hit with enhanced visualization
                 if output:
@@ -140,7 +169,7 @@ class Cache:
                 self._update_lru(set_index, entry)
 
                 # Calculate access time and update statistics
-                access_time = time() - start_time
+                access_time = perf_counter() - start_time
                 self._exec_time += access_time
                 self._update_stats(access_time)
 
@@ -171,31 +200,10 @@ class Cache:
                     }
                 )
 
-            # Create new entry
-            new_entry = {
-                "tag": tag,
-                "data": value,
-                "valid": True,
-                "dirty": False,
-                "lru": 0
-            }
-
-            # Handle set full condition
-            if len(self._entries[set_index]) >= self._associativity:
-                # Find LRU entry to replace
-                lru_entry = min(self._entries[set_index], key=lambda x: x["lru"])
-                if lru_entry["dirty"] and self._write_policy == "write-back":
-                    # Write back dirty data
-                    old_address = lru_entry["tag"] * (self._line_size * self._sets) + (set_index * self._line_size)
-                    self._next_level.write(old_address, lru_entry["data"])
-                self._entries[set_index].remove(lru_entry)
-
-            # Add new entry
-            self._entries[set_index].append(new_entry)
-            self._update_lru(set_index, new_entry)
+            self._fill(set_index, tag, value)
 
             # Calculate access time and update statistics
-            access_time = time() - start_time
+            access_time = perf_counter() - start_time
             self._exec_time += access_time
             self._update_stats(access_time)
 
@@ -203,6 +211,63 @@ class Cache:
         else:
             raise ValueError("No next level cache/memory available")
 
+    def peek(self, address):
+        """Return the value at an address without recording an access or changing any level"""
+        set_index, tag = self._calculate_cache_indices(address)
+        for entry in self._entries[set_index]:
+            if entry["tag"] == tag and entry["valid"]:
+                return int(entry["data"])
+        if not self._next_level:
+            raise ValueError("No next level cache/memory available")
+        return self._next_level.peek(address)
+
+    def prefetch(self, address):
+        """Bring the line holding an address into this cache ahead of its use
+
+        A prefetch is a hint: it is not counted as a hit or miss in this cache, is not logged,
+        and is ignored if the line is already present or the address is invalid. A dirty line
+        it evicts is still written back, which the next level counts as a write. Returns True
+        if a line was filled.
+        """
+        set_index, tag = self._calculate_cache_indices(address)
+        for entry in self._entries[set_index]:
+            if entry["tag"] == tag and entry["valid"]:
+                return False
+        if not self._next_level:
+            return False
+        try:
+            value = self._next_level.peek(address)
+        except ValueError:
+            return False
+
+        self._fill(set_index, tag, value, output=False)
+        return True
+
+    def _fill(self, set_index, tag, value, output=True):
+        """Add a clean line to a set, evicting (and writing back if dirty) its LRU line when full"""
+        new_entry = {
+            "tag": tag,
+            "data": value,
+            "valid": True,
+            "dirty": False,
+            "lru": 0
+        }
+
+        # Handle set full condition
+        if len(self._entries[set_index]) >= self._associativity:
+            # Find LRU entry to replace
+            lru_entry = min(self._entries[set_index], key=lambda x: x["lru"])
+            if lru_entry["dirty"] and self._write_policy == "write-back":
+                # Write back dirty data
+                old_address = lru_entry["tag"] * (self._line_size * self._sets) + (set_index * self._line_size)
+                self._next_level.write(old_address, lru_entry["data"], output=output)
+            self._entries[set_index].remove(lru_entry)
+
+        # Add new entry
+        self._entries[set_index].append(new_entry)
+        self._update_lru(set_index, new_entry)
+        self._mark_changed(set_index)
+
     def write(self, address, data, output=True, propagate=True):
         """Write data to cache
         Args:
@@ -211,13 +276,14 @@ class Cache:
             output: Whether to output debug information
             propagate: Whether to propagate writes to next level (used internally)
         """
-        start_time = time()
+        start_time = perf_counter()
 
         # Debug log for every write attempt
-        self._logger.log(LogLevel.DEBUG, f"\n=== Cache Write Operation ({self._name}) ===")
-        self._logger.log(LogLevel.DEBUG, f"Address: {address}, Data: {data}")
-        self._logger.log(LogLevel.DEBUG, f"Write Policy: {self._write_policy}")
-        self._logger.log(LogLevel.DEBUG, f"Current Stats - Hits: {self._stats['hits']}, Misses: {self._stats['misses']}")
+        if self._logger.should_log(LogLevel.DEBUG):
+            self._logger.log(LogLevel.DEBUG, f"\n=== Cache Write Operation ({self._name}) ===")
+            self._logger.log(LogLevel.DEBUG, f"Address: {address}, Data: {data}")
+            self._logger.log(LogLevel.DEBUG, f"Write Policy: {self._write_policy}")
+            self._logger.log(LogLevel.DEBUG, f"Current Stats - Hits: {self._stats['hits']}, Misses: {self._stats['misses']}")
 
         # Ensure data is integer
         data = int(data)
@@ -233,8 +299,9 @@ class Cache:
         # Calculate set index and tag using bit masking
         set_index, tag = self._calculate_cache_indices(address)
 
-        self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index}, Tag: {tag}")
-        self._logger.log(LogLevel.DEBUG, f"Current Set Contents: {self._entries[set_index]}")
+        if self._logger.should_log(LogLevel.DEBUG):
+            self._logger.log(LogLevel.DEBUG, f"Set Index: {set_index}, Tag: {tag}")
+            self._logger.log(LogLevel.DEBUG, f"Current Set Contents: {self._entries[set_index]}")
 
         # Check for hit
         hit_entry = None
@@ -267,6 +334,7 @@ class Cache:
 
             # Update data
             hit_entry["data"] = data
+            self._mark_changed(set_index)
 
             # Handle write policy
             if self._write_policy == "write-through" and self._next_level and propagate:
@@ -321,10 +389,11 @@ class Cache:
                     old_address = (lru_entry["tag"] << (offset_bits + index_bits)) | (set_index << offset_bits)
 
                     # Debug log address reconstruction
-                    self._logger.log(LogLevel.DEBUG, f"\n=== Write-Back Address Reconstruction ===")
-                    self._logger.log(LogLevel.DEBUG, f"Tag: {lru_entry['tag']}, Set Index: {set_index}")
-                    self._logger.log(LogLevel.DEBUG, f"Offset bits: {offset_bits}, Index bits: {index_bits}")
-                    self._logger.log(LogLevel.DEBUG, f"Reconstructed address: {old_address}")
+                    if self._logger.should_log(LogLevel.DEBUG):
+                        self._logger.log(LogLevel.DEBUG, f"\n=== Write-Back Address Reconstruction ===")
+                        self._logger.log(LogLevel.DEBUG, f"Tag: {lru_entry['tag']}, Set Index: {set_index}")
+                        self._logger.log(LogLevel.DEBUG, f"Offset bits: {offset_bits}, Index bits: {index_bits}")
+                        self._logger.log(LogLevel.DEBUG, f"Reconstructed address: {old_address}")
 
                     # Write back dirty data before eviction
                     self._next_level.write(old_address, lru_entry["data"], output, propagate=True)
@@ -333,6 +402,7 @@ class Cache:
             # Add new entry
             self._entries[set_index].append(new_entry)
             self._update_lru(set_index, new_entry)
+            self._mark_changed(set_index)
 
             # Handle write policy for new entries
             if self._write_policy == "write-through" and self._next_level and propagate:
@@ -340,12 +410,17 @@ class Cache:
                 self._next_level.write(address, data, output, propagate=True)
 
         # Calculate access time and update statistics
-        access_time = time() - start_time
+        access_time = perf_counter() - start_time
         self._exec_time += access_time
         self._update_stats(access_time)
 
         return True
 
+    def _mark_changed(self, set_index):
+        """Record that a set's contents changed"""
+        self._changed_sets.add(set_index)
+        self._version += 1
+
     def _update_lru(self, set_index, entry):
         """Update LRU counters for a set"""
         # Decrease all other entries' LRU values
@@ -369,14 +444,39 @@ class Cache:
                         f"hit_rate={self._stats['hits']/self._stats['reads'] if self._stats['reads'] > 0 else 0:.2%}")
 
     def get_cache_state(self):
-        """Return the current state of the cache as a dictionary mapping (set_index, block_index) to (tag, data)"""
+        """Return the current state of the cache as a dictionary mapping (set_index, block_index) to (tag, data)
+
+        The result is reused until the cache contents change, so callers must not modify it.
+        """
+        if self._state_cache is not None and self._state_cache[0] == self._version:
+            return self._state_cache[1]
         state = {}
         for set_idx in range(len(self._entries)):
             for block_idx, entry in enumerate(self._entries[set_idx]):
                 if entry["valid"]:
                     state[(set_idx, block_idx)] = (entry["tag"], entry["data"])
+        self._state_cache = (self._version, state)
         return state
 
+    def get_cache_blocks(self):
+        """Return the cache contents as a list of sets, each a list of (tag, data) per way (None if invalid)
+
+        The result is reused until the cache contents change, so callers must not modify it.
+        """
+        if self._blocks_cache is not None and self._blocks_cache[0] == self._version:
+            return self._blocks_cache[1]
+        blocks = [[(entry["tag"], entry["data"]) if entry["valid"] else None for entry in entries]
+                  for entries in self._entries]
+        self._blocks_cache = (self._version, blocks)
+        return blocks
+
+    def collect_changes(self):
+        """Return {set_index: [(tag, data), ...]} for every set modified since the last call, then clear the record"""
+        changes = {set_idx: [(entry["tag"], entry["data"]) if entry["valid"] else None for entry in self._entries[set_idx]]
+                   for set_idx in self._changed_sets}
+        self._changed_sets.clear()
+        return changes
+
     def get_performance_stats(self):
         """Get cache performance statistics"""
         total_accesses = self._stats['hits'] + self._stats['misses']
@@ -387,6 +487,10 @@ class Cache:
             'hit_rate': hit_rate
         }
 
+    def get_access_count(self):
+        """Get the number of accesses (hits plus misses) so far"""
+        return self._stats['hits'] + self._stats['misses']
+
     def debug_info(self):
         """Get debug information about cache state"""
         return {
@@ -397,6 +501,7 @@ class Cache:
             "sets": self._sets,
             "write_policy": self._write_policy,
             "performance_stats": self.get_performance_stats(),
+            "blocks": self.get_cache_blocks(),
             "entries": len([entry for entries in self._entries for entry in entries]),
             "dirty_entries": len([entry for entries in self._entries for entry in entries if entry["dirty"]])
         }
@@ -544,6 +649,15 @@ class Cache:
         self._logger.log(LogLevel.DEBUG, f"Clean entries: {sum(len(entries) for entries in self._entries) - dirty_count}")
         self._logger.log(LogLevel.DEBUG, "=== Write-back operation complete ===\n")
 
+    def invalidate(self):
+        """Write back dirty entries, then empty every set in place (statistics are kept)"""
+        self.write_back_all()
+        for set_index, entries in enumerate(self._entries):
+            if entries:
+                entries.clear()
+                self._mark_changed(set_index)
+        self._logger.log(LogLevel.DEBUG, f"{self._name} invalidated")
+
     def _get_main_memory(self):
         """Traverse the cache hierarchy to find the main memory"""
         current = self._next_level
@@ -1,13 +1,15 @@
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                            QHBoxLayout, QLabel, QPushButton, QFrame, QSlider,
-                            QTextEdit, QScrollArea, QTabWidget, QGridLayout, QDialog)
-from PyQt6.QtCore import Qt, QTimer, QPoint, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QPalette, QColor, QPainter, QPen, QBrush
+                            QHBoxLayout, QLabel, QPushButton, QFrame, QSlider, QCheckBox,
+                            QTextEdit, QScrollArea, QTabWidget, QGridLayout, QDialog,
+                            QToolTip)
+from PyQt6.QtCore import (Qt, QTimer, QPoint, QPointF, QLineF, QRect, QPropertyAnimation, QEasingCurve, QEvent,
+                          QObject, QThread, pyqtSignal, pyqtSlot, pyqtProperty)
+from PyQt6.QtGui import (QFont, QPalette, QColor, QPainter, QPen, QBrush, QImage, QPixmap, QPolygonF,
+                         QShortcut, QKeySequence)
+from collections import namedtuple
 import sys
 import os
 
-print("Starting simulator...")
-
 # Add the parent directory to the Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -16,74 +18,462 @@ from cache.cache import Cache
 from memory import MainMemory
 from utils.logger import Logger, LogLevel
 
-print("Imports successful...")
+# Shortest Run-mode timer interval; faster speeds run several instructions per tick instead
+MIN_TICK_MS = 50
+
+# Number of cache set rows visible at once in the cache status panel; the rest scroll
+VISIBLE_CACHE_ROWS = 4
+
+# Flow lines created up front and reused; segments beyond this many at once are not drawn
+FLOW_POOL_SIZE = 16
+
+# Shared display strings, reused instead of re-formatting identical text each refresh
+EMPTY_TEXT = "Empty"
+_BLOCK_TEXT_CACHE = {}  # (tag, value) -> "T:{tag} V:{value}"
+
+# Cache cell colors, pens and fonts, built once instead of per cell per paint
+COLOR_FILLED_L1 = QColor("#ff69b4")
+COLOR_FILLED_L2 = QColor("#9370db")
+BRUSH_CELL = QBrush(QColor("#1e1e1e"))
+PEN_EMPTY = QPen(QColor("#666666"))
+PEN_SET_LABEL = QPen(QColor("#aaaaaa"))
+
+# Flow and highlight colors, shared instead of parsed per animation or highlight
+COLOR_FLOW_READ = QColor("#00ff00")
+COLOR_FLOW_WRITE = QColor("#ff69b4")
+PEN_FLOW_READ = QPen(COLOR_FLOW_READ, 2, Qt.PenStyle.SolidLine)
+PEN_FLOW_WRITE = QPen(COLOR_FLOW_WRITE, 2, Qt.PenStyle.SolidLine)
+BRUSH_FLOW_READ = QBrush(COLOR_FLOW_READ)
+BRUSH_FLOW_WRITE = QBrush(COLOR_FLOW_WRITE)
+ARROW_SIZE = 10
+COS_30 = 0.866  # Arrow head sides are 30 degrees off the line
+SIN_30 = 0.5
+_HIGHLIGHT_BRUSHES = {}  # color -> darkened background brush for highlighted cache cells
+_GLOW_STYLES = {}  # (style, color) -> style with the highlight border appended
+FONT_BLOCK_FILLED = QFont()
+FONT_BLOCK_FILLED.setPointSize(9)
+FONT_BLOCK_FILLED.setBold(True)
+FONT_BLOCK_EMPTY = QFont()
+FONT_BLOCK_EMPTY.setPointSize(9)
+
+# Fonts shared by the section titles and labels, built once at import
+FONT_ARIAL_9 = QFont("Arial", 9)
+FONT_ARIAL_10 = QFont("Arial", 10)
+FONT_ARIAL_11 = QFont("Arial", 11)
+FONT_ARIAL_10_BOLD = QFont("Arial", 10, QFont.Weight.Bold)
+FONT_ARIAL_12_BOLD = QFont("Arial", 12, QFont.Weight.Bold)
+FONT_ARIAL_14_BOLD = QFont("Arial", 14, QFont.Weight.Bold)
+FONT_COURIER_9 = QFont("Courier", 9)
+FONT_COURIER_10 = QFont("Courier", 10)
+
+# Frame style shared by every section, register and memory block frame
+FRAME_BOX_RAISED = QFrame.Shape.Box | QFrame.Shadow.Raised
+
+# Style sheets: the main window's is parsed once for all of its widgets, matched by object name
+WINDOW_STYLE = """
+    QPushButton#systemInfoToggle, QPushButton#controlButton {
+        background-color: #2b2b2b;
+        color: #00ff00;
+        border: 1px solid #00ff00;
+        font-size: 10pt;
+    }
+    QPushButton#systemInfoToggle {
+        border-radius: 4px;
+        padding: 4px 8px;
+        min-width: 150px;
+    }
+    QPushButton#controlButton {
+        border-radius: 2px;
+        padding: 4px 12px;
+        min-width: 60px;
+        max-height: 24px;
+    }
+    QPushButton#systemInfoToggle:hover, QPushButton#controlButton:hover {
+        background-color: #3b3b3b;
+    }
+    QPushButton#systemInfoToggle:pressed, QPushButton#controlButton:pressed {
+        background-color: #1b1b1b;
+    }
+    QLabel#sectionHeader { color: #00ff00; }
+    QLabel#registerConfigTitle { margin-top: 10px; }
+    QLabel#pcValue { color: #0099ff; }
+    QLabel#instructionValue { color: #00ff00; }
+    QLabel#statusValue { color: #ffaa00; }
+    QLabel#registerValue {
+        background-color: #1e1e1e;
+        border: 1px solid #ffaa00;
+        border-radius: 2px;
+        padding: 0px 4px;
+    }
+    QLabel#l1Label { color: #ff69b4; }
+    QLabel#l2Label { color: #9370db; }
+    QFrame#cacheSeparator { background-color: #333333; }
+    QWidget#flowLayer { background: transparent; }
+    QLabel#speedLabel, QCheckBox#animateToggle, QCheckBox#prefetchToggle { color: #00ff00; font-size: 10pt; }
+    QSlider#speedSlider::groove:horizontal {
+        border: 1px solid #00ff00;
+        height: 4px;
+        background: #2b2b2b;
+        margin: 1px 0;
+        border-radius: 2px;
+    }
+    QSlider#speedSlider::handle:horizontal {
+        background: #00ff00;
+        border: 1px solid #00ff00;
+        width: 12px;
+        margin: -4px 0;
+        border-radius: 6px;
+    }
+"""
+REGISTER_TEXT = ('<table width="100%" cellspacing="0" cellpadding="0"><tr>'
+                 '<td style="color: #888888;">{name}</td>'
+                 '<td align="right" style="color: #ffaa00;">{value}</td>'
+                 '</tr></table>')
+
+def block_text(tag, value):
+    """Return the display text for a cache block, memoized per (tag, value)"""
+    key = (tag, value)
+    text = _BLOCK_TEXT_CACHE.get(key)
+    if text is None:
+        if len(_BLOCK_TEXT_CACHE) >= 1024:  # Keep the memo small for long-running programs
+            _BLOCK_TEXT_CACHE.clear()
+        text = _BLOCK_TEXT_CACHE[key] = f"T:{tag} V:{value}"
+    return text
+
+def register_text(name, value):
+    """Return the rich text showing a register's name and value in its label"""
+    return REGISTER_TEXT.format(name=name, value=value)
 
 class FlowLine(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.start_point = QPoint(0, 0)
         self.end_point = QPoint(0, 0)
+        self.line = QLineF()
+        self.arrow = None  # Arrow head polygon, None for a zero-length line
         self.active = False
-        self.color = QColor("#00ff00")  # Default green color
+        self.color = COLOR_FLOW_READ  # Default green color
+        self.pen = PEN_FLOW_READ
+        self.brush = BRUSH_FLOW_READ
+        self._opacity = 1.0
         self.setAutoFillBackground(False)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
     def set_points(self, start, end):
+        """Move the line, computing its arrow head once here rather than on every paint"""
         self.start_point = start
         self.end_point = end
+        self.line = QLineF(QPointF(start), QPointF(end))
+
+        dx = end.x() - start.x()
+        dy = end.y() - start.y()
+        length = (dx * dx + dy * dy) ** 0.5
+        if length == 0:
+            self.arrow = None
+        else:
+            dx /= length
+            dy /= length
+            x, y = end.x(), end.y()
+            self.arrow = QPolygonF([
+                QPointF(end),
+                QPointF(x - ARROW_SIZE * (dx * COS_30 + dy * SIN_30), y - ARROW_SIZE * (dy * COS_30 - dx * SIN_30)),
+                QPointF(x - ARROW_SIZE * (dx * COS_30 - dy * SIN_30), y - ARROW_SIZE * (dy * COS_30 + dx * SIN_30)),
+            ])
         self.update()
 
     def set_active(self, active, operation_type="read"):
         self.active = active
-        self.color = QColor("#00ff00") if operation_type == "read" else QColor("#ff69b4")
+        self.setVisible(active)  # Inactive lines get no paint events at all
+        if operation_type == "read":
+            self.color, self.pen, self.brush = COLOR_FLOW_READ, PEN_FLOW_READ, BRUSH_FLOW_READ
+        else:
+            self.color, self.pen, self.brush = COLOR_FLOW_WRITE, PEN_FLOW_WRITE, BRUSH_FLOW_WRITE
         self.update()
 
+    def get_opacity(self):
+        return self._opacity
+
+    def set_opacity(self, opacity):
+        self._opacity = opacity
+        self.update()
+
+    # Animated by the fade-out in SimulatorGUI._create_flow_animation
+    opacity = pyqtProperty(float, get_opacity, set_opacity)
+
     def paintEvent(self, event):
         if not self.active:
             return
 
+        # No antialiasing: the short-lived lines don't need it and it nearly doubles the draw cost
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        pen = QPen(self.color, 2, Qt.PenStyle.SolidLine)
-        painter.setPen(pen)
+        painter.setOpacity(self._opacity)
+        painter.setPen(self.pen)
 
         # Draw flow line with arrow
-        painter.drawLine(self.start_point, self.end_point)
-
-        # Draw arrow head
-        arrow_size = 10
-        angle = 30  # degrees
+        painter.drawLine(self.line)
+        if self.arrow is not None:
+            painter.setBrush(self.brush)
+            painter.drawPolygon(self.arrow)
+
+# One cell of a CacheView, used where the flow visualization needs a cache block's position
+CacheCell = namedtuple('CacheCell', ['view', 'set_idx', 'way'])
+
+class CacheView(QWidget):
+    """Paints every set x way cell of one cache level in a single widget
+
+    The view keeps the (tag, data) entry shown in each cell and only repaints cells whose entry
+    changed. The set labels, cell fill and grid lines never change, so they are drawn once into a
+    background pixmap; paintEvent blits it and draws just the text of rows inside the exposed
+    rectangle, so rows scrolled out of a surrounding scroll area cost nothing.
+    """
+    HEADER_WIDTH = 24
+    CELL_WIDTH = 75
+    CELL_HEIGHT = 20
+
+    def __init__(self, num_sets, ways, grid_color, filled_color, parent=None):
+        super().__init__(parent)
+        self.num_sets = num_sets
+        self.ways = ways
+        self.entries = [[None] * ways for _ in range(num_sets)]  # (tag, data) shown per cell
+        self.empty_ways = [None] * ways  # Padding for sets with fewer entries than ways
+        self.highlights = {}  # (set, way) -> background brush while highlighted
+        self.grid_pen = QPen(QColor(grid_color))
+        self.filled_pen = QPen(filled_color)
+        self.set_labels = [f"S{set_idx}" for set_idx in range(num_sets)]
+        self.background = None  # Static labels and grid, built in resizeEvent
+        # The background pixmap covers every pixel, so Qt can skip erasing behind each paint
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setFixedSize(self.HEADER_WIDTH + self.CELL_WIDTH * ways + 1, self.CELL_HEIGHT * num_sets + 1)
+
+    def cell_rect(self, set_idx, way):
+        return QRect(self.HEADER_WIDTH + way * self.CELL_WIDTH, set_idx * self.CELL_HEIGHT,
+                     self.CELL_WIDTH, self.CELL_HEIGHT)
+
+    def cell_text(self, set_idx, way):
+        entry = self.entries[set_idx][way]
+        return block_text(*entry) if entry is not None else EMPTY_TEXT
+
+    def set_entries(self, set_idx, entries):
+        """Show one set's (tag, data) entries, repainting only the cells that changed
+
+        Returns whether any cell changed.
+        """
+        if len(entries) < self.ways:
+            entries = [*entries, *self.empty_ways[len(entries):]]
+        row = self.entries[set_idx]
+        if row == entries:
+            return False
+        for way, (shown, entry) in enumerate(zip(row, entries)):
+            if shown != entry:
+                row[way] = entry
+                self.update(self.cell_rect(set_idx, way))
+        return True
+
+    def set_highlight(self, set_idx, way, brush):
+        """Tint a cell's background with brush, or clear the tint when brush is None"""
+        if brush is None:
+            self.highlights.pop((set_idx, way), None)
+        else:
+            self.highlights[(set_idx, way)] = brush
+        self.update(self.cell_rect(set_idx, way))
+
+    def resizeEvent(self, event):
+        """Draw the cell fill, set labels and grid lines into the background pixmap"""
+        ratio = self.devicePixelRatioF()
+        background = QPixmap(self.size() * ratio)
+        background.setDevicePixelRatio(ratio)
+        background.fill(BRUSH_CELL.color())
+
+        painter = QPainter(background)
+        painter.setFont(FONT_BLOCK_EMPTY)
+        for set_idx in range(self.num_sets):
+            y = set_idx * self.CELL_HEIGHT
+            painter.setPen(PEN_SET_LABEL)
+            painter.drawText(QRect(0, y, self.HEADER_WIDTH - 3, self.CELL_HEIGHT),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             self.set_labels[set_idx])
+            painter.setPen(self.grid_pen)
+            for way in range(self.ways):
+                painter.drawRect(self.cell_rect(set_idx, way))
+        painter.end()
+        self.background = background
 
-        # Calculate arrow head points
-        dx = self.end_point.x() - self.start_point.x()
-        dy = self.end_point.y() - self.start_point.y()
-        length = (dx * dx + dy * dy) ** 0.5
+    def paintEvent(self, event):
+        exposed = event.rect()
+        first = max(0, exposed.top() // self.CELL_HEIGHT)
+        last = min(self.num_sets - 1, exposed.bottom() // self.CELL_HEIGHT)
 
-        if length == 0:
-            return
+        painter = QPainter(self)
+        if self.background is not None:
+            painter.drawPixmap(0, 0, self.background)  # Clipped to the exposed region by Qt
+        else:
+            painter.fillRect(exposed, BRUSH_CELL)
+        highlights = self.highlights
+        for set_idx in range(first, last + 1):
+            for way, entry in enumerate(self.entries[set_idx]):
+                rect = self.cell_rect(set_idx, way)
+                brush = highlights.get((set_idx, way)) if highlights else None
+                if brush is not None:
+                    painter.fillRect(rect.adjusted(1, 1, 0, 0), brush)  # Inside the grid lines
+                if entry is not None:
+                    painter.setFont(FONT_BLOCK_FILLED)
+                    painter.setPen(self.filled_pen)
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, block_text(*entry))
+                else:
+                    painter.setFont(FONT_BLOCK_EMPTY)
+                    painter.setPen(PEN_EMPTY)
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, EMPTY_TEXT)
 
-        dx /= length
-        dy /= length
+class CacheMinimap(QLabel):
+    """Occupancy map of a whole cache level drawn from a QImage with one pixel per (set, way)
 
-        # Calculate arrow points
-        x1 = self.end_point.x() - arrow_size * (dx * 0.866 + dy * 0.5)
-        y1 = self.end_point.y() - arrow_size * (dy * 0.866 - dx * 0.5)
-        x2 = self.end_point.x() - arrow_size * (dx * 0.866 - dy * 0.5)
-        y2 = self.end_point.y() - arrow_size * (dy * 0.866 + dx * 0.5)
+    Filled ways get a color hashed from their value; hovering shows the block as a tooltip.
+    """
+    EMPTY_RGB = QColor("#1e1e1e").rgb()
 
-        # Draw arrow head
-        points = [self.end_point, QPoint(int(x1), int(y1)), QPoint(int(x2), int(y2))]
-        painter.setBrush(QBrush(self.color))
-        painter.drawPolygon(*points)
+    def __init__(self, num_sets, ways, cell_width=8, cell_height=5, parent=None):
+        super().__init__(parent)
+        self.ways = ways
+        self.num_sets = num_sets
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.filled = {}  # (set, way) -> (tag, data) for every filled way on the map
+        self.image = QImage(ways, num_sets, QImage.Format.Format_RGB32)
+        self.image.fill(self.EMPTY_RGB)
+        self.setFixedSize(ways * cell_width, num_sets * cell_height)
+        self.setMouseTracking(True)
+        self.refresh()
+
+    @staticmethod
+    def value_rgb(value):
+        """Return a stable color for a block value"""
+        return QColor.fromHsv(hash(value) * 37 % 360, 160, 230).rgb()
+
+    def set_state(self, state):
+        """Redraw from a full {(set, way): (tag, data)} cache state; returns True if any pixel
+        changed, in which case call refresh() afterwards
+
+        Only pixels whose entry was filled, changed or emptied since the last state are written.
+        """
+        filled = self.filled
+        changed = False
+        for key, entry in state.items():
+            if filled.get(key) != entry:
+                self.image.setPixel(key[1], key[0], self.value_rgb(entry[1]))
+                changed = True
+        for key in filled.keys() - state.keys():
+            self.image.setPixel(key[1], key[0], self.EMPTY_RGB)
+            changed = True
+        if changed:
+            self.filled = dict(state)
+        return changed
+
+    def set_entries(self, set_idx, entries):
+        """Update the pixels for one set from its (tag, data) entries; returns True if any pixel
+        changed, in which case call refresh() afterwards"""
+        filled = self.filled
+        changed = False
+        for way in range(self.ways):
+            entry = entries[way] if way < len(entries) else None
+            key = (set_idx, way)
+            if entry is None:
+                if filled.pop(key, None) is not None:
+                    self.image.setPixel(way, set_idx, self.EMPTY_RGB)
+                    changed = True
+            elif filled.get(key) != entry:
+                filled[key] = entry
+                self.image.setPixel(way, set_idx, self.value_rgb(entry[1]))
+                changed = True
+        return changed
+
+    def refresh(self):
+        """Blit the image, scaled up to the widget size"""
+        self.setPixmap(QPixmap.fromImage(self.image).scaled(
+            self.width(), self.height(),
+            Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation))
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        set_idx = pos.y() // self.cell_height
+        way = pos.x() // self.cell_width
+        if 0 <= set_idx < self.num_sets and 0 <= way < self.ways:
+            entry = self.filled.get((set_idx, way))
+            text = block_text(*entry) if entry is not None else EMPTY_TEXT
+            QToolTip.showText(event.globalPosition().toPoint(), f"S{set_idx} W{way}: {text}", self)
+        super().mouseMoveEvent(event)
+
+class MemoryMap(QLabel):
+    """Map of every main memory address drawn from a QImage with one pixel per byte
+
+    Used addresses are lit; hovering shows the address and its value as a tooltip.
+    """
+    EMPTY_RGB = CacheMinimap.EMPTY_RGB
+    USED_RGB = QColor("#00ff00").rgb()
+
+    def __init__(self, num_addresses, peek, columns=64, cell_size=6, parent=None):
+        super().__init__(parent)
+        self.num_addresses = num_addresses
+        self.peek = peek  # address -> value, without recording a simulated access
+        self.columns = columns
+        self.cell_size = cell_size
+        self.mask = bytearray(num_addresses)  # Used flags currently drawn
+        rows = (num_addresses + columns - 1) // columns
+        self.image = QImage(columns, rows, QImage.Format.Format_RGB32)
+        self.image.fill(self.EMPTY_RGB)
+        self.setFixedSize(columns * cell_size, rows * cell_size)
+        self.setMouseTracking(True)
+        self.refresh()
+
+    def set_mask(self, mask):
+        """Redraw the pixels whose used flag changed; returns True if any did"""
+        if mask == self.mask:
+            return False
+        columns = self.columns
+        for address, (shown, used) in enumerate(zip(self.mask, mask)):
+            if shown != used:
+                self.image.setPixel(address % columns, address // columns,
+                                    self.USED_RGB if used else self.EMPTY_RGB)
+        self.mask[:] = mask
+        return True
+
+    def refresh(self):
+        """Blit the image, scaled up to the widget size"""
+        self.setPixmap(QPixmap.fromImage(self.image).scaled(
+            self.width(), self.height(),
+            Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation))
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        address = pos.y() // self.cell_size * self.columns + pos.x() // self.cell_size
+        if 0 <= pos.x() < self.width() and 0 <= address < self.num_addresses:
+            QToolTip.showText(event.globalPosition().toPoint(),
+                              f"Address [{address}]: {self.peek(address)}", self)
+        super().mouseMoveEvent(event)
+
+class SimWorker(QObject):
+    """Runs ISA steps on a worker thread and reports each batch's delta back to the GUI
+
+    Only plain dicts cross the thread boundary; the GUI never reads the ISA or caches while a
+    batch is in flight.
+    """
+    stepped = pyqtSignal(dict)  # delta from SimpleISA.step_many() or {'error': str}
+
+    @pyqtSlot(object, int)
+    def step(self, isa, count):
+        """Execute up to count instructions of the program already loaded into isa"""
+        try:
+            delta = isa.step_many(count)
+        except Exception as e:
+            delta = {'error': str(e)}
+        self.stepped.emit(delta)
 
 class SimulatorGUI(QMainWindow):
+    step_requested = pyqtSignal(object, int)  # (isa, number of instructions to run)
+
     def __init__(self, main_memory=None, l1_cache=None, l2_cache=None):
-        print("Initializing GUI...")
         super().__init__()
         self.setWindowTitle("CPU & Cache Simulator")
         self.setMinimumSize(1200, 400)
-        print("Window created...")
 
         # Initialize dictionaries for UI elements
         self.register_labels = {}
@@ -100,24 +490,18 @@ class SimulatorGUI(QMainWindow):
             self.l2_cache = l2_cache
         else:
             # Create memory hierarchy with correct sizes
-            print("Setting up memory hierarchy...")
             self.main_memory = MainMemory("MainMemory", 1024)  # 1KB memory
 
-            # Initialize memory with test values
-            self.main_memory.write(100, 168)  # 42 shifted left by 2
-            self.main_memory.write(104, 61)   # 123 shifted right by 1
-            self.main_memory.write(108, 265)  # 255 + 10
-            self.main_memory.write(112, -5)   # 0 - 5
-            self.main_memory.write(116, 16)   # 16 AND 240
-            self.main_memory.write(120, 111)  # 99 OR 15
-            self.main_memory.write(124, 200)
-            self.main_memory.write(128, 300)
-            self.main_memory.write(132, 400)
-            self.main_memory.write(136, 500)
-            self.main_memory.write(140, 600)
-            self.main_memory.write(144, 700)
-            self.main_memory.write(148, 800)
-            self.main_memory.write(152, 900)
+            # Initialize memory with test values, one word every 4 bytes from address 100
+            self.main_memory.bulk_write(100, (
+                168,  # 42 shifted left by 2
+                61,   # 123 shifted right by 1
+                265,  # 255 + 10
+                -5,   # 0 - 5
+                16,   # 16 AND 240
+                111,  # 99 OR 15
+                200, 300, 400, 500, 600, 700, 800, 900,
+            ), stride=4)
 
             # Create L2 cache (slower, larger)
             self.l2_cache = Cache(
@@ -157,27 +541,64 @@ class SimulatorGUI(QMainWindow):
             ("Main Memory", "1024 bytes", "N/A", "N/A", "100ns", "N/A")
         ]
 
+        self._flow_anchors = {}  # register label or CacheCell -> center in flow layer coordinates
+
         # Setup UI
-        print("Setting up UI components...")
         self.setup_ui()
 
         # Initialize simulation state
         self.is_running = False
         self.simulation_speed = 1000
+        self.steps_per_tick = 1  # Instructions per Run tick; above 1 once the speed beats MIN_TICK_MS
         self.current_instruction = 0
         self.instructions = []
+        self.flow_operands = []  # Per instruction: ((source kind, value), (dest kind, value)) or None
+        self.animations_enabled = True
+        self.prefetch_lookahead = 0  # Applied to the ISA before each step, never while one runs
+        self._last_visualized_instr = -1  # Instruction the flow visualization last animated
+        self._update_pending = False  # A coalesced display refresh is queued
+        self._full_update_pending = False
+        self._pending_delta = {'regs': {}, 'l1_blocks': {}, 'l2_blocks': {}, 'l1_stats': False, 'l2_stats': False}
+        self._reg_shadow = dict.fromkeys(self.register_labels, 0)  # register -> value currently shown
+        self._reg_pairs = tuple((name, self.register_labels[name])
+                                for name in ('eax', 'ebx', 'ecx', 'edx', 'esi', 'edi'))
+        self._label_texts = {}  # label -> text last passed to _set_text()
+        self._stats_shown = {}  # stats label -> (hits, misses) it currently shows
+
+        # Display updates skipped as unchanged (hits) or applied (misses), counted with DEBUG logging
+        self.debug_ui_stats = self.logger.should_log(LogLevel.DEBUG)
+        self._ui_cache_hits = 0
+        self._ui_cache_misses = 0
+        QShortcut(QKeySequence("Ctrl+Shift+U"), self, activated=self.log_ui_cache_stats)
+
+        # Highlighted components -> their original style sheet (None for cache cells)
+        self._highlighted = {}
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setSingleShot(True)
+        self._highlight_timer.timeout.connect(self._clear_highlights)
+
+        # Run instructions on a worker thread; results come back as queued signals
+        self._step_in_flight = False
+        self._reset_pending = False
+        self._load_pending = None  # File to load once the in-flight step returns
+        self.worker = SimWorker()
+        self.worker_thread = QThread()
+        self.worker.moveToThread(self.worker_thread)
+        self.step_requested.connect(self.worker.step)
+        self.worker.stepped.connect(self._on_step_done)
+        self.worker_thread.start()
+        QApplication.instance().aboutToQuit.connect(self._stop_worker)
 
         # Setup timer for continuous execution
         self.timer = QTimer()
-        self.timer.timeout.connect(self.step_execution)
-        print("GUI initialization complete...")
+        self.timer.timeout.connect(self._run_tick)
 
-        self.used_memory_blocks = set([100, 104, 108, 112, 116, 120, 124, 128, 132, 136, 140, 144, 148, 152])
         self.memory_window = None  # Store reference to memory window
 
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
+        self.setStyleSheet(WINDOW_STYLE)
         main_layout = QVBoxLayout(central_widget)
         main_layout.setSpacing(4)
         main_layout.setContentsMargins(4, 4, 4, 4)
@@ -198,8 +619,7 @@ class SimulatorGUI(QMainWindow):
         self.system_info_section.setFixedWidth(300)
         left_layout.addWidget(self.system_info_section)
 
-        self.cpu_section.setFixedWidth(300)
-        left_layout.addWidget(self.cpu_section)
+        left_layout.addWidget(self.cpu_section)  # Already fixed at 300 wide
 
         left_layout.addWidget(self.register_section)
 
@@ -220,33 +640,27 @@ class SimulatorGUI(QMainWindow):
 
     def create_system_info_section(self):
         frame = QFrame()
-        frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
+        frame.setFrameStyle(FRAME_BOX_RAISED)
         layout = QVBoxLayout(frame)
         layout.setSpacing(4)
         layout.setContentsMargins(4, 4, 4, 4)
 
         # Create toggle button with left alignment
         toggle_button = QPushButton("Show System Information")
-        toggle_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2b2b2b;
-                color: #00ff00;
-                border: 1px solid #00ff00;
-                border-radius: 4px;
-                padding: 4px 8px;
-                font-size: 10pt;
-                min-width: 150px;
-            }
-            QPushButton:hover {
-                background-color: #3b3b3b;
-            }
-            QPushButton:pressed {
-                background-color: #1b1b1b;
-            }
-        """)
+        toggle_button.setObjectName("systemInfoToggle")
         layout.addWidget(toggle_button)
+        self._system_info_layout = layout
 
-        # Create container widget for system info
+        # The info body is built on the first toggle; it starts hidden
+        self.system_info_container = None
+
+        # Connect toggle button
+        toggle_button.clicked.connect(self.toggle_system_info)
+
+        return frame
+
+    def _build_system_info_body(self):
+        """Build the (initially hidden) system configuration tables under the toggle button"""
         self.system_info_container = QWidget()
         container_layout = QVBoxLayout(self.system_info_container)
         container_layout.setSpacing(4)
@@ -254,7 +668,7 @@ class SimulatorGUI(QMainWindow):
 
         # System Configuration title
         title = QLabel("System Configuration")
-        title.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        title.setFont(FONT_ARIAL_14_BOLD)
         container_layout.addWidget(title)
 
         # Create grid for system info
@@ -272,8 +686,8 @@ class SimulatorGUI(QMainWindow):
         headers = ["Component", "Size", "Line Size", "Associativity", "Access Time", "Write Policy"]
         for col, header in enumerate(headers):
             label = QLabel(header)
-            label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            label.setStyleSheet("color: #00ff00;")
+            label.setFont(FONT_ARIAL_10_BOLD)
+            label.setObjectName("sectionHeader")
             grid.addWidget(label, 0, col)
 
         # Cache data
@@ -289,8 +703,8 @@ class SimulatorGUI(QMainWindow):
 
         # Register Configuration
         reg_title = QLabel("Register Configuration")
-        reg_title.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        reg_title.setStyleSheet("margin-top: 10px;")
+        reg_title.setFont(FONT_ARIAL_12_BOLD)
+        reg_title.setObjectName("registerConfigTitle")
         container_layout.addWidget(reg_title)
 
         reg_grid = QGridLayout()
@@ -310,8 +724,8 @@ class SimulatorGUI(QMainWindow):
         reg_headers = ["Register", "Purpose"]
         for col, header in enumerate(reg_headers):
             label = QLabel(header)
-            label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            label.setStyleSheet("color: #00ff00;")
+            label.setFont(FONT_ARIAL_10_BOLD)
+            label.setObjectName("sectionHeader")
             reg_grid.addWidget(label, 0, col)
 
         # Register data
@@ -323,25 +737,24 @@ class SimulatorGUI(QMainWindow):
 
         # Initially hide the system info
         self.system_info_container.hide()
-        layout.addWidget(self.system_info_container)
-
-        # Connect toggle button
-        toggle_button.clicked.connect(self.toggle_system_info)
-
-        return frame
+        self._system_info_layout.addWidget(self.system_info_container)
 
     def toggle_system_info(self):
         """Toggle the visibility of system information"""
+        if self.system_info_container is None:
+            self._build_system_info_body()
         if self.system_info_container.isVisible():
             self.system_info_container.hide()
             self.sender().setText("Show System Information")
         else:
             self.system_info_container.show()
             self.sender().setText("Hide System Information")
+        # The register frame shifts with the system info body
+        self._clear_flow_anchors()
 
     def create_cpu_section(self):
         frame = QFrame()
-        frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
+        frame.setFrameStyle(FRAME_BOX_RAISED)
         layout = QVBoxLayout(frame)
         layout.setContentsMargins(4, 2, 4, 2)
         layout.setSpacing(2)
@@ -352,58 +765,56 @@ class SimulatorGUI(QMainWindow):
 
         # Title with smaller width
         title = QLabel("CPU & Instruction Status")
-        title.setFont(QFont("Arial", 9))
+        title.setFont(FONT_ARIAL_9)
         grid.addWidget(title, 0, 0, 1, 2)
 
         # Program Counter label and value
         pc_title = QLabel("PC:")  # Shortened
-        pc_title.setFont(QFont("Courier", 9))  # Smaller font
+        pc_title.setFont(FONT_COURIER_9)  # Smaller font
         grid.addWidget(pc_title, 1, 0)
 
         self.pc_label = QLabel("0x00")
-        self.pc_label.setFont(QFont("Courier", 9))  # Smaller font
-        self.pc_label.setStyleSheet("QLabel { color: #0099ff; }")
+        self.pc_label.setFont(FONT_COURIER_9)  # Smaller font
+        self.pc_label.setObjectName("pcValue")
         grid.addWidget(self.pc_label, 1, 1)
 
         # Current Instruction label and value
         instr_title = QLabel("Instr:")  # Shortened
-        instr_title.setFont(QFont("Courier", 9))  # Smaller font
+        instr_title.setFont(FONT_COURIER_9)  # Smaller font
         grid.addWidget(instr_title, 0, 2)
 
         self.instruction_label = QLabel("None")
-        self.instruction_label.setFont(QFont("Courier", 9))  # Smaller font
-        self.instruction_label.setStyleSheet("QLabel { color: #00ff00; }")
+        self.instruction_label.setFont(FONT_COURIER_9)  # Smaller font
+        self.instruction_label.setObjectName("instructionValue")
         grid.addWidget(self.instruction_label, 0, 3)
 
         # Status label and value
         status_title = QLabel("Status:")
-        status_title.setFont(QFont("Courier", 9))  # Smaller font
+        status_title.setFont(FONT_COURIER_9)  # Smaller font
         grid.addWidget(status_title, 1, 2)
 
         self.status_label = QLabel("Ready")
-        self.status_label.setFont(QFont("Courier", 9))  # Smaller font
-        self.status_label.setStyleSheet("QLabel { color: #ffaa00; }")
+        self.status_label.setFont(FONT_COURIER_9)  # Smaller font
+        self.status_label.setObjectName("statusValue")
         grid.addWidget(self.status_label, 1, 3)
 
         # Add grid to main layout
         layout.addLayout(grid)
 
-        frame.setFixedWidth(300)  # Reduced from 400
-        frame.setFixedHeight(45)  # Reduced from 50
+        frame.setFixedSize(300, 45)  # Reduced from 400x50
         return frame
 
     def create_register_section(self):
         frame = QFrame()
-        frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-        frame.setFixedWidth(300)  # Reduced from 400
-        frame.setFixedHeight(90)  # Reduced from 100
+        frame.setFrameStyle(FRAME_BOX_RAISED)
+        frame.setFixedSize(300, 90)  # Reduced from 400x100
         layout = QVBoxLayout(frame)
         layout.setContentsMargins(4, 2, 4, 2)  # Minimal margins
         layout.setSpacing(2)  # Minimal spacing
 
         # Header layout for title
         title = QLabel("Registers")
-        title.setFont(QFont("Arial", 10))  # Smaller font
+        title.setFont(FONT_ARIAL_10)  # Smaller font
         layout.addWidget(title)
 
         # Create register grid
@@ -420,33 +831,15 @@ class SimulatorGUI(QMainWindow):
             row = i // 2
             col = i % 2
 
-            reg_frame = QFrame()
-            reg_frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-            reg_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #1e1e1e;
-                    border: 1px solid #ffaa00;
-                    border-radius: 2px;
-                }
-            """)
-            reg_layout = QHBoxLayout(reg_frame)
-            reg_layout.setContentsMargins(4, 2, 4, 2)  # Minimal margins
-            reg_layout.setSpacing(4)  # Minimal spacing
-
-            reg_label = QLabel(reg_name)
-            reg_label.setFont(QFont("Courier", 9))  # Smaller font
-            reg_label.setStyleSheet("QLabel { color: #888888; }")
-            reg_layout.addWidget(reg_label)
-
-            value_label = QLabel("0")
-            value_label.setFont(QFont("Courier", 9))  # Smaller font
-            value_label.setStyleSheet("QLabel { color: #ffaa00; }")
-            value_label.setAlignment(Qt.AlignmentFlag.AlignRight)
-            self.register_labels[reg_name] = value_label
-            reg_layout.addWidget(value_label)
-
-            reg_frame.setFixedHeight(24)  # Match cache block height
-            register_grid.addWidget(reg_frame, row, col)
+            # One rich-text label shows both the register name and its value
+            reg_label = QLabel(register_text(reg_name, 0))
+            reg_label.setTextFormat(Qt.TextFormat.RichText)
+            reg_label.setFrameStyle(FRAME_BOX_RAISED)
+            reg_label.setObjectName("registerValue")
+            reg_label.setFont(FONT_COURIER_9)
+            reg_label.setFixedHeight(24)  # Match cache block height
+            self.register_labels[reg_name] = reg_label
+            register_grid.addWidget(reg_label, row, col)
 
         # Add the grid to the layout
         layout.addLayout(register_grid)
@@ -454,7 +847,7 @@ class SimulatorGUI(QMainWindow):
 
     def create_memory_section(self):
         frame = QFrame()
-        frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
+        frame.setFrameStyle(FRAME_BOX_RAISED)
         frame.setMinimumWidth(900)
         frame.setMaximumHeight(180)
 
@@ -469,18 +862,18 @@ class SimulatorGUI(QMainWindow):
         header_layout.setSpacing(8)
 
         title = QLabel("Cache Status")
-        title.setFont(QFont("Arial", 11))
+        title.setFont(FONT_ARIAL_11)
         header_layout.addWidget(title)
 
         # Stats in single compact line
         self.l1_stats_label = QLabel("L1: H:0 M:0 R:0%")  # Shortened stats
-        self.l1_stats_label.setFont(QFont("Arial", 10))
-        self.l1_stats_label.setStyleSheet("color: #ff69b4;")
+        self.l1_stats_label.setFont(FONT_ARIAL_10)
+        self.l1_stats_label.setObjectName("l1Label")
         header_layout.addWidget(self.l1_stats_label)
 
         self.l2_stats_label = QLabel("L2: H:0 M:0 R:0%")  # Shortened stats
-        self.l2_stats_label.setFont(QFont("Arial", 10))
-        self.l2_stats_label.setStyleSheet("color: #9370db;")
+        self.l2_stats_label.setFont(FONT_ARIAL_10)
+        self.l2_stats_label.setObjectName("l2Label")
         header_layout.addWidget(self.l2_stats_label)
 
         main_layout.addWidget(header)
@@ -498,55 +891,30 @@ class SimulatorGUI(QMainWindow):
         l1_layout.setContentsMargins(0, 0, 0, 0)
         l1_widget.setFixedWidth(240)  # Adjusted for 75px blocks
 
-        l1_title = QLabel("L1 (2-way)")
-        l1_title.setFont(QFont("Arial", 9))  # Smaller font
-        l1_title.setStyleSheet("color: #ff69b4;")
+        l1_title = QLabel(f"L1 ({self.l1_cache.associativity}-way)")
+        l1_title.setFont(FONT_ARIAL_9)  # Smaller font
+        l1_title.setObjectName("l1Label")
         l1_layout.addWidget(l1_title)
 
-        l1_grid = QGridLayout()
-        l1_grid.setSpacing(1)
-        l1_grid.setHorizontalSpacing(1)
-        l1_grid.setVerticalSpacing(1)
-        self.l1_blocks = {}
-
-        for row, set_idx in enumerate([0, 4, 8, 12]):
-            set_label = QLabel(f"S{set_idx}")
-            set_label.setStyleSheet("color: #aaaaaa; font-size: 9pt;")
-            set_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            set_label.setFixedWidth(20)
-            l1_grid.addWidget(set_label, row, 0)
-
-            for way in range(2):
-                block = QFrame()
-                block.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-                block.setFixedSize(75, 20)  # Set to 75px width
-                block.setStyleSheet("""
-                    QFrame {
-                        background-color: #1e1e1e;
-                        border: 1px solid #ff69b4;
-                        border-radius: 2px;
-                    }
-                """)
-
-                layout = QHBoxLayout(block)
-                layout.setContentsMargins(2, 1, 2, 1)  # Minimal margins
-                layout.setSpacing(0)
-
-                value_label = QLabel("Empty")
-                value_label.setStyleSheet("color: #666666; font-size: 9pt;")
-                value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                layout.addWidget(value_label)
-
-                self.l1_blocks[f"{set_idx}_{way}"] = value_label
-                l1_grid.addWidget(block, row, way + 1)
-
-        l1_layout.addLayout(l1_grid)
+        # One painted row per set, built from the cache's real geometry
+        l1_sets = self.l1_cache.num_sets
+        l1_ways = self.l1_cache.associativity
+        self.l1_view = CacheView(l1_sets, l1_ways, "#ff69b4", COLOR_FILLED_L1)
+
+        # Scrolling view of the sets next to a minimap of all of them
+        self.l1_minimap = CacheMinimap(l1_sets, l1_ways)
+        l1_row = QHBoxLayout()
+        l1_row.setSpacing(4)
+        l1_row.addWidget(self._create_cache_scroll(self.l1_view))
+        l1_row.addWidget(self.l1_minimap, alignment=Qt.AlignmentFlag.AlignTop)
+        l1_row.addStretch()
+        l1_layout.addLayout(l1_row)
         cache_layout.addWidget(l1_widget)
 
         # Thin separator
         separator = QFrame()
         separator.setFrameShape(QFrame.Shape.VLine)
-        separator.setStyleSheet("background-color: #333333;")
+        separator.setObjectName("cacheSeparator")
         separator.setFixedWidth(1)
         cache_layout.addWidget(separator)
 
@@ -557,49 +925,24 @@ class SimulatorGUI(QMainWindow):
         l2_layout.setContentsMargins(0, 0, 0, 0)
         l2_widget.setFixedWidth(460)  # Adjusted for 75px blocks
 
-        l2_title = QLabel("L2 (4-way)")
-        l2_title.setFont(QFont("Arial", 9))  # Smaller font
-        l2_title.setStyleSheet("color: #9370db;")
+        l2_title = QLabel(f"L2 ({self.l2_cache.associativity}-way)")
+        l2_title.setFont(FONT_ARIAL_9)  # Smaller font
+        l2_title.setObjectName("l2Label")
         l2_layout.addWidget(l2_title)
 
-        l2_grid = QGridLayout()
-        l2_grid.setSpacing(1)
-        l2_grid.setHorizontalSpacing(1)
-        l2_grid.setVerticalSpacing(1)
-        self.l2_blocks = {}
-
-        for row, set_idx in enumerate([0, 4, 8, 12]):
-            set_label = QLabel(f"S{set_idx}")
-            set_label.setStyleSheet("color: #aaaaaa; font-size: 9pt;")
-            set_label.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            set_label.setFixedWidth(20)
-            l2_grid.addWidget(set_label, row, 0)
-
-            for way in range(4):
-                block = QFrame()
-                block.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-                block.setFixedSize(75, 20)  # Set to 75px width
-                block.setStyleSheet("""
-                    QFrame {
-                        background-color: #1e1e1e;
-                        border: 1px solid #9370db;
-                        border-radius: 2px;
-                    }
-                """)
-
-                layout = QHBoxLayout(block)
-                layout.setContentsMargins(2, 1, 2, 1)  # Minimal margins
-                layout.setSpacing(0)
-
-                value_label = QLabel("Empty")
-                value_label.setStyleSheet("color: #666666; font-size: 9pt;")
-                value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                layout.addWidget(value_label)
-
-                self.l2_blocks[f"{set_idx}_{way}"] = value_label
-                l2_grid.addWidget(block, row, way + 1)
-
-        l2_layout.addLayout(l2_grid)
+        # One painted row per set, built from the cache's real geometry
+        l2_sets = self.l2_cache.num_sets
+        l2_ways = self.l2_cache.associativity
+        self.l2_view = CacheView(l2_sets, l2_ways, "#9370db", COLOR_FILLED_L2)
+
+        # Scrolling view of the sets next to a minimap of all of them
+        self.l2_minimap = CacheMinimap(l2_sets, l2_ways)
+        l2_row = QHBoxLayout()
+        l2_row.setSpacing(4)
+        l2_row.addWidget(self._create_cache_scroll(self.l2_view))
+        l2_row.addWidget(self.l2_minimap, alignment=Qt.AlignmentFlag.AlignTop)
+        l2_row.addStretch()
+        l2_layout.addLayout(l2_row)
         cache_layout.addWidget(l2_widget)
 
         main_layout.addWidget(cache_container)
@@ -607,53 +950,64 @@ class SimulatorGUI(QMainWindow):
         # Flow visualization layer
         self.flow_layer = QWidget(frame)
         self.flow_layer.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        self.flow_layer.setStyleSheet("background: transparent;")
-        self.flow_lines = []
+        self.flow_layer.setObjectName("flowLayer")
+        self.flow_lines = set()  # Lines currently fading out
+
+        # Each pooled line keeps its own fade-out animation and returns to the pool when it ends
+        self._flow_pool = []
+        for _ in range(FLOW_POOL_SIZE):
+            flow = FlowLine(self.flow_layer)
+            flow.hide()
+            fade = QPropertyAnimation(flow, b"opacity", flow)
+            fade.setDuration(1000)
+            fade.setStartValue(1.0)
+            fade.setEndValue(0.0)
+            fade.setEasingCurve(QEasingCurve.Type.OutQuad)
+            fade.finished.connect(self._release_flow)
+            self._flow_pool.append((flow, fade))
 
         return frame
 
+    def _create_cache_scroll(self, view):
+        """Wrap a CacheView in a scroll area showing VISIBLE_CACHE_ROWS sets at a time"""
+        scroll = QScrollArea()
+        scroll.setWidget(view)
+        scroll.setWidgetResizable(False)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+
+        # Scrolling moves the cells under the flow layer
+        scroll.verticalScrollBar().valueChanged.connect(self._clear_flow_anchors)
+
+        visible_rows = min(view.num_sets, VISIBLE_CACHE_ROWS)
+        scroll_width = scroll.verticalScrollBar().sizeHint().width() if view.num_sets > visible_rows else 0
+        scroll.setFixedSize(view.width() + scroll_width, CacheView.CELL_HEIGHT * visible_rows + 1)
+        return scroll
+
     def create_controls(self):
         frame = QFrame()
-        frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
+        frame.setFrameStyle(FRAME_BOX_RAISED)
         frame.setFixedHeight(40)  # Set fixed compact height
 
         layout = QHBoxLayout(frame)
         layout.setContentsMargins(4, 2, 4, 2)  # Minimal margins
         layout.setSpacing(8)  # Spacing between controls
 
-        # Control buttons with compact styling
-        button_style = """
-            QPushButton {
-                background-color: #2b2b2b;
-                color: #00ff00;
-                border: 1px solid #00ff00;
-                border-radius: 2px;
-                padding: 4px 12px;
-                font-size: 10pt;
-                min-width: 60px;
-                max-height: 24px;
-            }
-            QPushButton:hover {
-                background-color: #3b3b3b;
-            }
-            QPushButton:pressed {
-                background-color: #1b1b1b;
-            }
-        """
-
+        # Control buttons with compact styling from WINDOW_STYLE
         self.step_button = QPushButton("Step")
         self.step_button.clicked.connect(self.step_execution)
-        self.step_button.setStyleSheet(button_style)
+        self.step_button.setObjectName("controlButton")
         layout.addWidget(self.step_button)
 
         self.run_button = QPushButton("Run")
         self.run_button.clicked.connect(self.toggle_run)
-        self.run_button.setStyleSheet(button_style)
+        self.run_button.setObjectName("controlButton")
         layout.addWidget(self.run_button)
 
         self.reset_button = QPushButton("Reset")
         self.reset_button.clicked.connect(self.reset_simulation)
-        self.reset_button.setStyleSheet(button_style)
+        self.reset_button.setObjectName("controlButton")
         layout.addWidget(self.reset_button)
 
         # Add small spacer
@@ -661,34 +1015,34 @@ class SimulatorGUI(QMainWindow):
 
         # Speed control with compact layout
         speed_label = QLabel("Speed:")
-        speed_label.setStyleSheet("QLabel { color: #00ff00; font-size: 10pt; }")
+        speed_label.setObjectName("speedLabel")
         speed_label.setFixedWidth(45)
         layout.addWidget(speed_label)
 
         self.speed_slider = QSlider(Qt.Orientation.Horizontal)
-        self.speed_slider.setMinimum(100)
+        self.speed_slider.setMinimum(10)
         self.speed_slider.setMaximum(2000)
         self.speed_slider.setValue(1000)
+        # Only apply the speed once a drag is released, not for every intermediate position
+        self.speed_slider.setTracking(False)
         self.speed_slider.valueChanged.connect(self.update_speed)
         self.speed_slider.setFixedWidth(200)  # Limit slider width
-        self.speed_slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                border: 1px solid #00ff00;
-                height: 4px;
-                background: #2b2b2b;
-                margin: 1px 0;
-                border-radius: 2px;
-            }
-            QSlider::handle:horizontal {
-                background: #00ff00;
-                border: 1px solid #00ff00;
-                width: 12px;
-                margin: -4px 0;
-                border-radius: 6px;
-            }
-        """)
+        self.speed_slider.setObjectName("speedSlider")
         layout.addWidget(self.speed_slider)
 
+        # Flow lines and highlights can be switched off for fast runs
+        animate_toggle = QCheckBox("Animate")
+        animate_toggle.setChecked(True)
+        animate_toggle.setObjectName("animateToggle")
+        animate_toggle.toggled.connect(self.set_animations_enabled)
+        layout.addWidget(animate_toggle)
+
+        # Prefetch one stride ahead of loads through an induction register
+        prefetch_toggle = QCheckBox("Prefetch")
+        prefetch_toggle.setObjectName("prefetchToggle")
+        prefetch_toggle.toggled.connect(self.set_prefetch_enabled)
+        layout.addWidget(prefetch_toggle)
+
         # Add stretch to push everything to the left
         layout.addStretch()
 
@@ -701,251 +1055,509 @@ class SimulatorGUI(QMainWindow):
 
     def load_instructions(self, filename):
         """Load instructions from file"""
+        if self._step_in_flight:
+            # The worker is using the ISA; load once its step returns
+            self._load_pending = filename
+            return
+
         try:
             with open(filename, 'r') as f:
-                # Filter out empty lines and comments
-                self.instructions = []
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comment-only lines
-                    if not line or line.startswith(';'):
-                        continue
-                    # For lines with inline comments, only keep the instruction part
-                    if ';' in line:
-                        line = line.split(';')[0].strip()
-                    if line:  # Only add non-empty lines
-                        self.instructions.append(line)
+                text = f.read()
+
+            # Keep the instruction part of each line, dropping comments and empty lines
+            self.instructions = [
+                instruction for line in text.splitlines()
+                if (instruction := line.split(';', 1)[0].strip())
+            ]
 
+            # Parse once here; steps only dispatch already decoded instructions
+            self.isa.load_program(self.instructions)
+            self.flow_operands = [self._parse_flow_operands(instruction) for instruction in self.instructions]
             self.current_instruction = 0
-            self.instruction_label.setText("None")
-            self.pc_label.setText("0x00")
-            self.status_label.setText("Ready")
-            self.update_display()
+            self._last_visualized_instr = -1
+            self._set_text(self.instruction_label, "None")
+            self._set_text(self.pc_label, "0x00")
+            self._set_text(self.status_label, "Ready")
+            self._schedule_update()
         except Exception as e:
-            self.status_label.setText(f"Error loading instructions - {str(e)}")
+            self._set_text(self.status_label, f"Error loading instructions - {str(e)}")
 
     def step_execution(self):
-        """Execute one instruction and update display"""
+        """Hand the next instruction to the worker thread; the display updates when it finishes"""
+        self._request_steps(1)
+
+    def _run_tick(self):
+        """Run mode timer tick: execute a batch of instructions per display refresh"""
+        self._request_steps(self.steps_per_tick)
+
+    def _request_steps(self, count):
+        """Hand up to count instructions to the worker thread"""
+        if self._step_in_flight:
+            return
+
         if self.current_instruction < len(self.instructions):
             instruction = self.instructions[self.current_instruction]
             # Show a cleaner instruction display (without any trailing comments)
-            self.instruction_label.setText(instruction)
-            self.pc_label.setText(f"0x{self.current_instruction:02x}")
-            self.status_label.setText("Executing...")
-
-            # Force GUI update
-            QApplication.processEvents()
-
-            try:
-                # First load the program if we haven't already
-                if self.current_instruction == 0:
-                    self.isa.load_program(self.instructions)
-
-                # Execute one step
-                result = self.isa.execute_step()
-                if result:
-                    self.status_label.setText("Instruction Complete")
-                else:
-                    self.status_label.setText("Program Halted")
-                    self.timer.stop()
-                    self.is_running = False
-                    self.run_button.setText("Run")
-
-            except Exception as e:
-                self.status_label.setText(f"Error - {str(e)}")
-                self.timer.stop()
-                self.is_running = False
-                self.run_button.setText("Run")
-
-            self.current_instruction += 1
-            self.update_display()
-
-            # Force another GUI update after state changes
-            QApplication.processEvents()
+            self._set_text(self.instruction_label, instruction)
+            self._set_text(self.pc_label, f"0x{self.current_instruction:02x}")
+            self._set_text(self.status_label, "Executing...")
+
+            self._step_in_flight = True
+            self.isa.prefetch_lookahead = self.prefetch_lookahead
+            count = min(count, len(self.instructions) - self.current_instruction)
+            self.step_requested.emit(self.isa, count)
+        else:
+            self.timer.stop()
+            self.is_running = False
+            self.run_button.setText("Run")
+            self._set_text(self.status_label, "Program Complete")
+
+    def _set_text(self, label, text):
+        """Set a label's text unless the same text was already set through this helper"""
+        changed = self._label_texts.get(label) != text
+        if changed:
+            self._label_texts[label] = text
+            label.setText(text)
+        if self.debug_ui_stats:
+            self._count_ui_update(changed)
+
+    def _set_stats(self, label, level, stats):
+        """Show a cache's statistics, formatting the text only when the counts changed"""
+        counts = (stats['hits'], stats['misses'])
+        if self._stats_shown.get(label) == counts:
+            if self.debug_ui_stats:
+                self._count_ui_update(False)
+        else:
+            self._stats_shown[label] = counts
+            self._set_text(label,
+                f"{level} Cache: Hits: {stats['hits']}, "
+                f"Misses: {stats['misses']}, "
+                f"Hit Rate: {stats['hit_rate']:.2f}%"
+            )
+
+    def _count_ui_update(self, changed):
+        """Count one display update as applied (a miss) or skipped as unchanged (a hit)"""
+        if changed:
+            self._ui_cache_misses += 1
         else:
+            self._ui_cache_hits += 1
+
+    def get_ui_cache_stats(self):
+        """Return how many display updates the change checks skipped; counted only with debug_ui_stats"""
+        total = self._ui_cache_hits + self._ui_cache_misses
+        return {
+            "hits": self._ui_cache_hits,
+            "misses": self._ui_cache_misses,
+            "hit_rate": (self._ui_cache_hits / total * 100) if total > 0 else 0,
+        }
+
+    def log_ui_cache_stats(self):
+        """Log the display update counters (Ctrl+Shift+U)"""
+        self.logger.log_performance(self.get_ui_cache_stats())
+
+    def _on_step_done(self, delta):
+        """Apply the result of a step run by the worker thread"""
+        self._step_in_flight = False
+        if self._reset_pending or self._load_pending is not None:
+            # Reset was pressed or a program loaded while this step ran; drop its result and
+            # apply them now
+            if self._reset_pending:
+                self._reset_pending = False
+                self.reset_simulation()
+            if self._load_pending is not None:
+                filename, self._load_pending = self._load_pending, None
+                self.load_instructions(filename)
+            return
+
+        if 'error' in delta:
+            self._set_text(self.status_label, f"Error - {delta['error']}")
             self.timer.stop()
             self.is_running = False
             self.run_button.setText("Run")
-            self.status_label.setText("Program Complete")
-            QApplication.processEvents()
+            delta = None  # Full refresh after a failed step
+        elif delta['running']:
+            self._set_text(self.status_label, "Instruction Complete")
+        else:
+            self._set_text(self.status_label, "Program Halted")
+            self.timer.stop()
+            self.is_running = False
+            self.run_button.setText("Run")
+
+        steps = delta['steps'] if delta else 1
+        if steps > 1:
+            # Show the last instruction of the batch
+            last = self.current_instruction + steps - 1
+            self._set_text(self.instruction_label, self.instructions[last])
+            self._set_text(self.pc_label, f"0x{last:02x}")
+        self.current_instruction += steps
+        self._schedule_update(delta)
+
+    def _stop_worker(self):
+        """Stop the worker thread and wait for any running step to finish"""
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+
+    def closeEvent(self, event):
+        self._stop_worker()
+        super().closeEvent(event)
 
     def toggle_run(self):
         """Toggle between run and pause states"""
         self.is_running = not self.is_running
         if self.is_running:
             self.run_button.setText("Pause")
-            self.timer.start(self.simulation_speed)
+            self.timer.start(max(self.simulation_speed, MIN_TICK_MS))
         else:
             self.run_button.setText("Run")
             self.timer.stop()
 
     def reset_simulation(self):
         """Reset the simulation to initial state"""
+        if self._step_in_flight:
+            # The worker is using the ISA and caches; reset once its step returns
+            self._reset_pending = True
+            return
+
         self.current_instruction = 0
-        self.isa = SimpleISA(memory=self.main_memory, cache=self.l1_cache)
-        self.status_label.setText("Ready")
-        self.instruction_label.setText("None")
-        self.pc_label.setText("0x00")
-        self.update_display()
+        self._last_visualized_instr = -1
+        self.isa.reset()
+        self.l1_cache.invalidate()
+        self.l2_cache.invalidate()
+        self._set_text(self.status_label, "Ready")
+        self._set_text(self.instruction_label, "None")
+        self._set_text(self.pc_label, "0x00")
+        self._schedule_update()
         if self.is_running:
             self.toggle_run()
 
+    def set_animations_enabled(self, enabled):
+        """Turn the flow lines and component highlights on or off"""
+        self.animations_enabled = enabled
+
+    def set_prefetch_enabled(self, enabled):
+        """Turn prefetching for loads through induction registers on or off from the next step"""
+        self.prefetch_lookahead = 1 if enabled else 0
+
     def update_speed(self, value):
         """Update simulation speed"""
         self.simulation_speed = value
+        self.steps_per_tick = max(1, MIN_TICK_MS // value)
         if self.is_running:
-            self.timer.setInterval(value)
+            self.timer.setInterval(max(value, MIN_TICK_MS))
 
-    def update_display(self):
-        """Update all visual elements based on current state"""
-        # Update registers
-        for reg_name in ['eax', 'ebx', 'ecx', 'edx', 'esi', 'edi']:
-            value = self.isa.registers.get(reg_name, 0)
-            self.register_labels[reg_name].setText(f"{value}")
-
-        # Get cache states
-        l1_info = self.l1_cache.get_cache_state()
-        l2_info = self.l2_cache.get_cache_state()
-
-        # Update L1 Cache blocks
-        used_sets = [0, 4, 8, 12]
-        for set_idx in used_sets:
-            for block_idx in range(2):  # 2-way associative
-                block_key = f"{set_idx}_{block_idx}"
-                if block_key in self.l1_blocks:
-                    value_label = self.l1_blocks[block_key]
-                    if (set_idx, block_idx) in l1_info:
-                        tag, value = l1_info[(set_idx, block_idx)]
-                        display_text = f"T:{tag} V:{value}"
-                        value_label.setText(display_text)
-                        value_label.setStyleSheet("QLabel { color: #ff69b4; font-weight: bold; }")
-                    else:
-                        value_label.setText("Empty")
-                        value_label.setStyleSheet("QLabel { color: #666666; }")
-
-        # Update L2 Cache blocks
-        used_sets_l2 = [0, 4, 8, 12]
-        for set_idx in used_sets_l2:
-            for block_idx in range(4):  # 4-way associative
-                block_key = f"{set_idx}_{block_idx}"
-                if block_key in self.l2_blocks:
-                    value_label = self.l2_blocks[block_key]
-                    if (set_idx, block_idx) in l2_info:
-                        tag, value = l2_info[(set_idx, block_idx)]
-                        display_text = f"T:{tag} V:{value}"
-                        value_label.setText(display_text)
-                        value_label.setStyleSheet("QLabel { color: #9370db; font-weight: bold; }")
-                    else:
-                        value_label.setText("Empty")
-                        value_label.setStyleSheet("QLabel { color: #666666; }")
+    def _schedule_update(self, delta=None):
+        """Queue a display refresh for the next event loop iteration, coalescing repeated requests
 
-        # Update cache statistics
-        l1_stats = self.l1_cache.get_performance_stats()
-        l2_stats = self.l2_cache.get_performance_stats()
+        With a delta only the changed elements are refreshed; without one the whole display is.
+        Deltas queued before the refresh runs are merged.
+        """
+        if delta is None:
+            self._full_update_pending = True
+        else:
+            pending = self._pending_delta
+            pending['regs'].update(delta['regs'])
+            pending['l1_blocks'].update(delta['l1_blocks'])
+            pending['l2_blocks'].update(delta['l2_blocks'])
+            pending['l1_stats'] = pending['l1_stats'] or delta['l1_stats']
+            pending['l2_stats'] = pending['l2_stats'] or delta['l2_stats']
+
+        if not self._update_pending:
+            self._update_pending = True
+            QTimer.singleShot(0, self._do_update)
+
+    def _do_update(self):
+        """Run the queued display refresh"""
+        self._update_pending = False
+
+        # The worker owns the ISA and caches until its step finishes; _on_step_done reschedules
+        if self._step_in_flight:
+            return
+
+        delta = self._pending_delta
+        self._pending_delta = {'regs': {}, 'l1_blocks': {}, 'l2_blocks': {}, 'l1_stats': False, 'l2_stats': False}
+
+        # Nothing is drawn while hidden or minimized; refresh everything once shown again
+        if not self.isVisible() or self.windowState() & Qt.WindowState.WindowMinimized:
+            self._full_update_pending = True
+            return
+
+        # Hold back repaints until every label and cell has been updated; Qt then repaints
+        # everything that changed in one pass once control returns to the event loop. Painting
+        # is re-enabled even if the refresh fails part way.
+        self.setUpdatesEnabled(False)
+        try:
+            if self._full_update_pending:
+                self._full_update_pending = False
+                self.update_display()
+            else:
+                self.apply_delta(delta)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def showEvent(self, event):
+        """Apply any refresh skipped while the window was hidden"""
+        super().showEvent(event)
+        if self._full_update_pending:
+            self._schedule_update()
+
+    def changeEvent(self, event):
+        """Apply any refresh skipped while the window was minimized"""
+        super().changeEvent(event)
+        if (event.type() == QEvent.Type.WindowStateChange and self._full_update_pending
+                and not self.windowState() & Qt.WindowState.WindowMinimized):
+            self._schedule_update()
 
-        self.l1_stats_label.setText(
-            f"L1 Cache: Hits: {l1_stats['hits']}, "
-            f"Misses: {l1_stats['misses']}, "
-            f"Hit Rate: {l1_stats['hit_rate']:.2f}%"
-        )
+    def update_display(self):
+        """Update all visual elements based on current state
 
-        self.l2_stats_label.setText(
-            f"L2 Cache: Hits: {l2_stats['hits']}, "
-            f"Misses: {l2_stats['misses']}, "
-            f"Hit Rate: {l2_stats['hit_rate']:.2f}%"
-        )
+        Labels and cells whose shown value already matches the state are left untouched, so a
+        refresh right after a reset that changed nothing issues no setText() calls for them.
+        """
+        # Update registers
+        registers = self.isa.registers
+        shown = self._reg_shadow
+        for reg_name, label in self._reg_pairs:
+            value = registers.get(reg_name, 0)
+            changed = shown[reg_name] != value
+            if changed:
+                shown[reg_name] = value
+                label.setText(register_text(reg_name, value))
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+
+        # Get cache states as [set][way] -> (tag, data) lists
+        l1_blocks = self.l1_cache.get_cache_blocks()
+        l2_blocks = self.l2_cache.get_cache_blocks()
+
+        # Update L1 and L2 Cache blocks
+        for set_idx, entries in enumerate(l1_blocks):
+            changed = self.l1_view.set_entries(set_idx, entries)
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+        for set_idx, entries in enumerate(l2_blocks):
+            changed = self.l2_view.set_entries(set_idx, entries)
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+
+        # Update the minimaps from the filled ways only, re-blitting those that changed
+        if self.l1_minimap.set_state(self.l1_cache.get_cache_state()):
+            self.l1_minimap.refresh()
+        if self.l2_minimap.set_state(self.l2_cache.get_cache_state()):
+            self.l2_minimap.refresh()
+
+        self._finish_update()
+
+    def apply_delta(self, delta):
+        """Update only the visual elements mentioned in a delta produced by SimpleISA.step_many()
+
+        The cache sets in the delta come from Cache.collect_changes().
+        """
+        # Update changed registers; merged deltas may hold a register that changed back
+        shown = self._reg_shadow
+        for reg_name, value in delta['regs'].items():
+            if reg_name not in shown:
+                continue
+            changed = shown[reg_name] != value
+            if changed:
+                shown[reg_name] = value
+                self.register_labels[reg_name].setText(register_text(reg_name, value))
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+
+        # Update changed cache sets; a minimap is re-blitted only if one of its pixels changed
+        l1_map_changed = l2_map_changed = False
+        for set_idx, entries in delta['l1_blocks'].items():
+            l1_map_changed |= self.l1_minimap.set_entries(set_idx, entries)
+            changed = self.l1_view.set_entries(set_idx, entries)
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+        for set_idx, entries in delta['l2_blocks'].items():
+            l2_map_changed |= self.l2_minimap.set_entries(set_idx, entries)
+            changed = self.l2_view.set_entries(set_idx, entries)
+            if self.debug_ui_stats:
+                self._count_ui_update(changed)
+        if l1_map_changed:
+            self.l1_minimap.refresh()
+        if l2_map_changed:
+            self.l2_minimap.refresh()
+
+        self._finish_update(delta['l1_stats'], delta['l2_stats'])
+
+    def _finish_update(self, l1_stats=True, l2_stats=True):
+        """Refresh the cache statistics, flow visualization and memory window
+
+        Statistics are only refreshed for cache levels flagged as accessed.
+        """
+        # Update cache statistics
+        if l1_stats:
+            self._set_stats(self.l1_stats_label, "L1", self.l1_cache.get_performance_stats())
+        if l2_stats:
+            self._set_stats(self.l2_stats_label, "L2", self.l2_cache.get_performance_stats())
 
         # Update flow visualization
         self._update_flow_visualization()
 
-        # Update memory window if it exists
-        self.update_memory_display()
-
-        # Force immediate update
-        self.repaint()
-        QApplication.processEvents()
+        # Update memory window if it exists; memory only changes through a cache access
+        if l1_stats or l2_stats:
+            self.update_memory_display()
 
     def _highlight_component(self, widget, color, duration=500):
-        """Highlight a component with a glowing effect"""
-        original_style = widget.styleSheet()
-        glow_style = original_style + f"""
+        """Highlight a component with a glowing effect
+
+        All highlights share one timer and are cleared together once the latest one expires,
+        so a component highlighted again while still glowing keeps its original style.
+        """
+        if isinstance(widget, CacheCell):
+            # Cache cells are painted by their CacheView; tint the cell background instead
+            brush = _HIGHLIGHT_BRUSHES.get(color)
+            if brush is None:
+                brush = _HIGHLIGHT_BRUSHES[color] = QBrush(QColor(color).darker(300))
+            widget.view.set_highlight(widget.set_idx, widget.way, brush)
+            self._highlighted[widget] = None
+        else:
+            original_style = self._highlighted.get(widget)
+            if original_style is None:
+                original_style = self._highlighted[widget] = widget.styleSheet()
+            glow_style = _GLOW_STYLES.get((original_style, color))
+            if glow_style is None:
+                glow_style = _GLOW_STYLES[(original_style, color)] = original_style + f"""
             QFrame {{
                 border: 2px solid {color};
-                box-shadow: 0 0 10px {color};
             }}
         """
-        widget.setStyleSheet(glow_style)
-        QTimer.singleShot(duration, lambda: widget.setStyleSheet(original_style))
+            widget.setStyleSheet(glow_style)
+        self._highlight_timer.start(duration)
+
+    def _clear_highlights(self):
+        """Restore every highlighted component once the highlight timer expires"""
+        for widget, original_style in self._highlighted.items():
+            if original_style is None:
+                widget.view.set_highlight(widget.set_idx, widget.way, None)
+            else:
+                widget.setStyleSheet(original_style)
+        self._highlighted.clear()
 
     def _create_flow_animation(self, source_pos, dest_pos, color="#00ff00"):
-        """Create an animated flow line between two points"""
-        flow = FlowLine(self.flow_layer)
+        """Show a pooled flow line between two points and start its fade-out
+
+        When every pooled line is still fading the segment is dropped rather than allocating
+        another widget.
+        """
+        if not self._flow_pool:
+            return
+        flow, fade = self._flow_pool.pop()
         flow.set_points(source_pos, dest_pos)
         flow.set_active(True)
 
-        # Create fade-out animation
-        fade = QPropertyAnimation(flow, b"opacity")
-        fade.setDuration(1000)
-        fade.setStartValue(1.0)
-        fade.setEndValue(0.0)
-        fade.setEasingCurve(QEasingCurve.Type.OutQuad)
-        fade.finished.connect(lambda: self.flow_lines.remove(flow))
-
-        self.flow_lines.append(flow)
+        self.flow_lines.add(flow)
         fade.start()
 
-    def _update_flow_visualization(self):
-        """Update the flow visualization based on current operation"""
-        if not hasattr(self, 'current_instruction') or self.current_instruction >= len(self.instructions):
-            return
+    def _release_flow(self):
+        """Hide the flow line whose fade-out just finished and return it to the pool"""
+        fade = self.sender()
+        flow = fade.targetObject()
+        flow.set_active(False)
+        self.flow_lines.discard(flow)
+        self._flow_pool.append((flow, fade))
 
-        instruction = self.instructions[self.current_instruction]
-        parts = instruction.split()
+    def _flow_anchor(self, widget):
+        """Return the center of a register label or cache cell in flow layer coordinates
 
+        Positions only move on resize, scrolling or a layout change, so they are cached until
+        _clear_flow_anchors() is called.
+        """
+        pos = self._flow_anchors.get(widget)
+        if pos is None:
+            if isinstance(widget, CacheCell):
+                view = widget.view
+                pos = view.mapTo(self.flow_layer, view.cell_rect(widget.set_idx, widget.way).center())
+            else:
+                pos = widget.mapTo(self.flow_layer, QPoint(widget.width()//2, widget.height()//2))
+            self._flow_anchors[widget] = pos
+        return pos
+
+    def _clear_flow_anchors(self):
+        """Forget the cached flow anchor positions after the widgets moved"""
+        self._flow_anchors.clear()
+
+    def resizeEvent(self, event):
+        """Drop flow anchor positions cached for the old layout"""
+        super().resizeEvent(event)
+        self._clear_flow_anchors()
+
+    def _parse_flow_operands(self, instruction):
+        """Classify the operands of an instruction for the flow visualization
+
+        Returns ((kind, value), (kind, value)) for the source and destination, where kind is
+        'reg' with a register name, 'mem' with an address, or None. Returns None for
+        instructions without operands.
+        """
+        parts = instruction.split()
         if len(parts) < 2:
+            return None
+
+        def operand(token):
+            if token in self.register_labels:
+                return ('reg', token)
+            if token.startswith("["):
+                try:
+                    return ('mem', int(token.strip("[]")))
+                except ValueError:
+                    pass
+            return (None, None)
+
+        return operand(parts[1]), operand(parts[2]) if len(parts) > 2 else (None, None)
+
+    @staticmethod
+    def _cached_way(cache, address):
+        """Return the way of cache holding address's line, or None if the line is not cached"""
+        tag = cache.get_tag(address)
+        for way, block in enumerate(cache.get_cache_blocks()[cache.get_set_index(address)]):
+            if block is not None and block[0] == tag:
+                return way
+        return None
+
+    def _update_flow_visualization(self):
+        """Update the flow visualization based on current operation
+
+        Each instruction is animated once; refreshes that did not advance the program, such as
+        re-showing the window, leave the visualization alone.
+        """
+        if not hasattr(self, 'current_instruction') or self.current_instruction >= len(self.instructions):
+            return
+        if not self.animations_enabled or self.current_instruction == self._last_visualized_instr:
             return
+        self._last_visualized_instr = self.current_instruction
 
-        op = parts[0]
-        source = parts[1]
-        dest = parts[2] if len(parts) > 2 else None
+        operands = self.flow_operands[self.current_instruction]
+        if operands is None:
+            return
+        (source_kind, source), (dest_kind, dest) = operands
 
         # Find affected components
         source_widget = None
         dest_widget = None
         intermediate_widgets = []
 
-        if source in self.register_labels:
+        if source_kind == 'reg':
             source_widget = self.register_labels[source]
-        elif source.startswith("["):
-            addr = int(source.strip("[]"))
-            set_idx = (addr // 4) * 4
-            if set_idx in [0, 4, 8, 12]:
-                # Check L1 cache first
-                for way in range(2):
-                    key = f"{set_idx}_{way}"
-                    if key in self.l1_blocks:
-                        source_widget = self.l1_blocks[key]
-                        break
-
-                # If not in L1, check L2
-                if not source_widget:
-                    for way in range(4):
-                        key = f"{set_idx}_{way}"
-                        if key in self.l2_blocks:
-                            source_widget = self.l2_blocks[key]
-                            intermediate_widgets.append(self.l1_blocks[f"{set_idx}_0"])
-                            break
-
-        if dest:
-            if dest in self.register_labels:
-                dest_widget = self.register_labels[dest]
-            elif dest.startswith("["):
-                addr = int(dest.strip("[]"))
-                set_idx = (addr // 4) * 4
-                if set_idx in [0, 4, 8, 12]:
-                    dest_widget = self.l1_blocks[f"{set_idx}_0"]
-                    # For writes, we need to update L2 as well
-                    intermediate_widgets.append(self.l2_blocks[f"{set_idx}_0"])
+        elif source_kind == 'mem':
+            # Read from L1 if the line is there; otherwise it comes from L2 through L1
+            l1_set = self.l1_cache.get_set_index(source)
+            l1_way = self._cached_way(self.l1_cache, source)
+            if l1_way is not None:
+                source_widget = CacheCell(self.l1_view, l1_set, l1_way)
+            else:
+                l2_way = self._cached_way(self.l2_cache, source)
+                source_widget = CacheCell(self.l2_view, self.l2_cache.get_set_index(source), l2_way or 0)
+                intermediate_widgets.append(CacheCell(self.l1_view, l1_set, 0))
+
+        if dest_kind == 'reg':
+            dest_widget = self.register_labels[dest]
+        elif dest_kind == 'mem':
+            dest_widget = CacheCell(self.l1_view, self.l1_cache.get_set_index(dest), 0)
+            # For writes, we need to update L2 as well
+            intermediate_widgets.append(CacheCell(self.l2_view, self.l2_cache.get_set_index(dest), 0))
 
         # Create flow visualizations
         if source_widget and dest_widget:
@@ -955,10 +1567,8 @@ class SimulatorGUI(QMainWindow):
             # Create flow animations
             prev_widget = source_widget
             for widget in intermediate_widgets + [dest_widget]:
-                source_pos = prev_widget.mapTo(self.flow_layer,
-                    QPoint(prev_widget.width()//2, prev_widget.height()//2))
-                dest_pos = widget.mapTo(self.flow_layer,
-                    QPoint(widget.width()//2, widget.height()//2))
+                source_pos = self._flow_anchor(prev_widget)
+                dest_pos = self._flow_anchor(widget)
                 self._create_flow_animation(source_pos, dest_pos)
                 self._highlight_component(widget, "#ff69b4")
                 prev_widget = widget
@@ -966,20 +1576,19 @@ class SimulatorGUI(QMainWindow):
     def show_used_memory(self):
         if self.memory_window is None:
             self.memory_window = QWidget(None)  # Create as independent window
-            self.memory_window.setWindowTitle("Memory Block Details")
+            self.memory_window.setWindowTitle("Memory Values")
             self.memory_window.setMinimumWidth(400)  # Increased width for more info
 
             layout = QVBoxLayout()
 
             # Add description
-            description = QLabel("Memory blocks and their cache references:")
-            description.setFont(QFont("Courier", 10))
+            description = QLabel("Addresses holding nonzero values (hover for the value):")
+            description.setFont(FONT_COURIER_10)
             layout.addWidget(description)
 
-            # Create a grid for memory blocks
-            self.memory_grid = QGridLayout()
-            self.memory_grid.setSpacing(4)  # Add some spacing between blocks
-            layout.addLayout(self.memory_grid)
+            # One pixel per address, peeked so that displaying memory doesn't count as simulated accesses
+            self.memory_map = MemoryMap(self.main_memory.size, self.main_memory.peek)
+            layout.addWidget(self.memory_map)
 
             self.memory_window.setLayout(layout)
 
@@ -994,75 +1603,25 @@ class SimulatorGUI(QMainWindow):
             self.memory_window.raise_()
 
     def update_memory_display(self):
-        """Update the memory display window with just address and value"""
+        """Light the memory map's addresses that hold nonzero values"""
         if self.memory_window is None or not self.memory_window.isVisible():
             return
 
-        # Clear existing widgets from grid
-        while self.memory_grid.count():
-            item = self.memory_grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-
-        # Add memory blocks to grid
-        sorted_blocks = sorted(self.used_memory_blocks)
-        for i, addr in enumerate(sorted_blocks):
-            row = i // 3  # 3 columns for wider blocks
-            col = i % 3
-
-            # Create frame for each memory block
-            block_frame = QFrame()
-            block_frame.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-            block_frame.setStyleSheet("""
-                QFrame {
-                    background-color: #1e1e1e;
-                    border: 1px solid #666666;
-                    border-radius: 2px;
-                }
-            """)
-
-            block_layout = QVBoxLayout()
-            block_layout.setSpacing(2)
-            block_layout.setContentsMargins(4, 4, 4, 4)
-
-            # Add address header
-            addr_label = QLabel(f"Address [{addr}]")
-            addr_label.setFont(QFont("Courier", 9, QFont.Weight.Bold))
-            addr_label.setStyleSheet("color: #00ff00;")
-            addr_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            block_layout.addWidget(addr_label)
-
-            # Add memory value
-            value = self.main_memory.read(addr)
-            value_label = QLabel(f"Value: {value}")
-            value_label.setFont(QFont("Courier", 9))
-            value_label.setStyleSheet("color: #ffffff;")
-            value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            block_layout.addWidget(value_label)
-
-            block_frame.setLayout(block_layout)
-            self.memory_grid.addWidget(block_frame, row, col)
-
-        # Update window title and description
-        self.memory_window.setWindowTitle("Memory Values")
-
-        # Force layout update
-        self.memory_window.adjustSize()
+        changed = self.memory_map.set_mask(self.main_memory.used_mask())
+        if changed:
+            self.memory_map.refresh()
+        if self.debug_ui_stats:
+            self._count_ui_update(changed)
 
 def main():
-    print("Starting main application...")
     app = QApplication(sys.argv)
-    print("Created QApplication...")
     window = SimulatorGUI()
-    print("Created main window...")
 
     # Get test file from command line or use default
     test_file = sys.argv[1] if len(sys.argv) > 1 else 'tests/test_program.txt'
     window.load_instructions(test_file)
-    print(f"Loaded instructions from {test_file}...")
 
     window.show()
-    print("Showing window...")
     sys.exit(app.exec())
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum, auto
-from time import time
+from time import perf_counter
 import logging
 
 # Import existing utilities
@@ -39,12 +39,76 @@ class InstructionType(Enum):
     PRINT_CACHE = auto()  # Print cache state
     PRINT_REG = auto()    # Print register state
 
+# Operand kinds, decoded once per program in load_program(); memory kinds compare >= OPERAND_MEM
+OPERAND_IMM = 0      # '#n': value is the int n
+OPERAND_REG = 1      # anything else: value is the text, a register (or label) name
+OPERAND_MEM = 2      # '[n]': value is the int address n
+OPERAND_MEM_REG = 3  # '[reg]': value is the name of the register holding the address
+
+# A decoded operand: (kind, value, original text)
+Operand = Tuple[int, object, str]
+
+def decode_operand(text: str) -> Operand:
+    """Decode an operand's addressing mode and value; raises ValueError for a malformed immediate"""
+    if text.startswith('#'):
+        return (OPERAND_IMM, int(text[1:]), text)
+    if text.startswith('['):
+        expr = text[1:-1]
+        if expr.isdigit():
+            return (OPERAND_MEM, int(expr), text)
+        return (OPERAND_MEM_REG, expr, text)
+    return (OPERAND_REG, text, text)
+
 @dataclass
 class Instruction:
     """Represents a single instruction"""
     type: InstructionType
     operands: List[str]
     line_number: int
+    args: Tuple[Operand, ...] = ()  # Decoded operands
+    error: Optional[Exception] = None  # Raised when executed if the operands failed to decode
+    prefetch_stride: int = 0  # Step of the induction register a '[reg]' source reads through, or 0
+
+# Instructions whose first operand, when a register, is written
+_WRITES_DEST = frozenset({
+    InstructionType.MOV, InstructionType.LOAD, InstructionType.STORE, InstructionType.ADD,
+    InstructionType.SUB, InstructionType.INC, InstructionType.DEC, InstructionType.NOT,
+    InstructionType.AND, InstructionType.OR, InstructionType.XOR, InstructionType.TEST,
+    InstructionType.SHL, InstructionType.SHR,
+})
+
+def _find_induction_registers(instructions: List[Instruction]) -> Dict[str, int]:
+    """Map each induction register to its stride
+
+    An induction register is only stepped by ADD/SUB with an immediate, INC or DEC, all by
+    the same stride (so unrolled loops qualify), and otherwise only set from immediates.
+    """
+    strides: Dict[str, int] = {}
+    rejected = {'eax'}  # CMP writes eax
+    for instruction in instructions:
+        if instruction.type not in _WRITES_DEST or not instruction.args:
+            continue
+        dest_kind, _, dest = instruction.args[0]
+        if dest_kind != OPERAND_REG:
+            continue
+        args = instruction.args
+        stride = None
+        if instruction.type is InstructionType.INC:
+            stride = 1
+        elif instruction.type is InstructionType.DEC:
+            stride = -1
+        elif len(args) == 2 and args[1][0] == OPERAND_IMM:
+            if instruction.type is InstructionType.ADD:
+                stride = args[1][1]
+            elif instruction.type is InstructionType.SUB:
+                stride = -args[1][1]
+            elif instruction.type is InstructionType.MOV:
+                continue
+        if stride is None or strides.get(dest, stride) != stride:
+            rejected.add(dest)
+        else:
+            strides[dest] = stride
+    return {reg: stride for reg, stride in strides.items() if stride and reg not in rejected}
 
 class SimpleISA:
     def __init__(self, memory: Optional[Memory] = None, cache: Optional[Cache] = None):
@@ -67,8 +131,9 @@ class SimpleISA:
         self.running = False
 
         # Memory system
-        self.memory = memory
-        self.cache = cache
+        self._memory = memory
+        self._cache = cache
+        self._bind_memory_access()
 
         # Logging
         self.logger = Logger()
@@ -80,13 +145,84 @@ class SimpleISA:
         self.max_instructions = 100  # Limit execution in test mode
         self.end_time = 0
 
+        # Strides ahead to prefetch for loads through an induction register; 0 disables prefetching
+        self.prefetch_lookahead = 0
+
+        # Instruction type -> handler taking the decoded operands. Jump handlers return the next
+        # pc; all other handlers return None. HALT is handled in execute_step().
+        self._dispatch = {
+            InstructionType.MOV: self._execute_mov,
+            InstructionType.LOAD: self._execute_load,
+            InstructionType.STORE: self._execute_store,
+            InstructionType.ADD: self._execute_add,
+            InstructionType.SUB: self._execute_sub,
+            InstructionType.INC: self._execute_inc,
+            InstructionType.DEC: self._execute_dec,
+            InstructionType.NOT: self._execute_not,
+            InstructionType.AND: self._execute_and,
+            InstructionType.OR: self._execute_or,
+            InstructionType.XOR: self._execute_xor,
+            InstructionType.CMP: self._execute_cmp,
+            InstructionType.TEST: self._execute_test,
+            InstructionType.SHL: self._execute_shl,
+            InstructionType.SHR: self._execute_shr,
+            InstructionType.JMP: self._execute_jmp,
+            InstructionType.JZ: self._execute_jz,
+            InstructionType.JNZ: self._execute_jnz,
+            InstructionType.PRINT_CACHE: self._execute_print_cache,
+            InstructionType.PRINT_REG: self._execute_print_reg,
+        }
+
+    @property
+    def memory(self) -> Optional[Memory]:
+        return self._memory
+
+    @memory.setter
+    def memory(self, memory: Optional[Memory]) -> None:
+        self._memory = memory
+        self._bind_memory_access()
+
+    @property
+    def cache(self) -> Optional[Cache]:
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: Optional[Cache]) -> None:
+        self._cache = cache
+        self._bind_memory_access()
+
+    def _bind_memory_access(self) -> None:
+        """Bind the read/write methods the handlers call, so each access skips the attribute
+        lookups on the cache and memory objects"""
+        cache = self._cache
+        memory = self._memory
+        # _read goes through the cache if there is one; _write_memory() writes through both
+        self._cache_write = cache.write if cache else None
+        self._prefetch = cache.prefetch if cache else None
+        self._mem_write = memory.write if memory else None
+        if cache:
+            self._read = cache.read
+        else:
+            self._read = memory.read if memory else None
+
+    def reset(self) -> None:
+        """Rewind to the start of the loaded program with cleared registers and statistics"""
+        for reg in self.registers:
+            self.registers[reg] = 0
+        self.pc = 0
+        self.running = bool(self.instructions)
+        self.instruction_count = 0
+        self.start_time = 0
+        self.end_time = 0
+
     def load_program(self, program: List[str]) -> None:
         """Load a program into the ISA"""
-        self.instructions = []
-        self.labels = {}
         self.pc = 0
         self.running = True
 
+        self.instructions = []
+        self.labels = {}
+
         for i, line in enumerate(program):
             line = line.strip()
             if not line or line.startswith(';'):
@@ -96,7 +232,8 @@ class SimpleISA:
             if line.endswith(':'):
                 label = line[:-1].strip()
                 self.labels[label] = len(self.instructions)
-                self.logger.log(LogLevel.DEBUG, f"Found label {label} at instruction {len(self.instructions)}")
+                if self.logger.should_log(LogLevel.DEBUG):
+                    self.logger.log(LogLevel.DEBUG, f"Found label {label} at instruction {len(self.instructions)}")
                 continue
 
             # Split the line and filter out comments
@@ -114,11 +251,25 @@ class SimpleISA:
             try:
                 inst_type = InstructionType[instruction_parts[0].upper()]
                 operands = instruction_parts[1:]
-                self.instructions.append(Instruction(inst_type, operands, i))
-                self.logger.log(LogLevel.DEBUG, f"Loaded instruction: {inst_type.name} {operands}")
+                try:
+                    instruction = Instruction(inst_type, operands, i, tuple(map(decode_operand, operands)))
+                except ValueError as e:
+                    # Keep the instruction so that the error surfaces when it executes
+                    instruction = Instruction(inst_type, operands, i, error=e)
+                self.instructions.append(instruction)
+                if self.logger.should_log(LogLevel.DEBUG):
+                    self.logger.log(LogLevel.DEBUG, f"Loaded instruction: {inst_type.name} {operands}")
             except KeyError:
                 self.logger.log(LogLevel.ERROR, f"Unknown instruction: {instruction_parts[0]}")
 
+        # Mark loads through an induction register, so execute_step() can prefetch ahead of them
+        induction = _find_induction_registers(self.instructions)
+        if induction:
+            for instruction in self.instructions:
+                if (instruction.type in (InstructionType.MOV, InstructionType.LOAD)
+                        and len(instruction.args) == 2 and instruction.args[1][0] == OPERAND_MEM_REG):
+                    instruction.prefetch_stride = induction.get(instruction.args[1][1], 0)
+
     def execute_step(self) -> bool:
         """Execute one instruction"""
         if not self.running or self.pc >= len(self.instructions):
@@ -129,51 +280,21 @@ class SimpleISA:
         self.instruction_count += 1
 
         try:
-            if instruction.type == InstructionType.MOV:
-                self._execute_mov(instruction.operands)
-            elif instruction.type == InstructionType.LOAD:
-                self._execute_load(instruction.operands)
-            elif instruction.type == InstructionType.STORE:
-                self._execute_store(instruction.operands)
-            elif instruction.type == InstructionType.ADD:
-                self._execute_add(instruction.operands)
-            elif instruction.type == InstructionType.SUB:
-                self._execute_sub(instruction.operands)
-            elif instruction.type == InstructionType.INC:
-                self._execute_inc(instruction.operands)
-            elif instruction.type == InstructionType.DEC:
-                self._execute_dec(instruction.operands)
-            elif instruction.type == InstructionType.NOT:
-                self._execute_not(instruction.operands)
-            elif instruction.type == InstructionType.AND:
-                self._execute_and(instruction.operands)
-            elif instruction.type == InstructionType.OR:
-                self._execute_or(instruction.operands)
-            elif instruction.type == InstructionType.XOR:
-                self._execute_xor(instruction.operands)
-            elif instruction.type == InstructionType.CMP:
-                self._execute_cmp(instruction.operands)
-            elif instruction.type == InstructionType.TEST:
-                self._execute_test(instruction.operands)
-            elif instruction.type == InstructionType.SHL:
-                self._execute_shift(instruction.operands, True)
-            elif instruction.type == InstructionType.SHR:
-                self._execute_shift(instruction.operands, False)
-            elif instruction.type == InstructionType.JMP:
-                self.pc = self._execute_jmp(instruction.operands)
-            elif instruction.type == InstructionType.JZ:
-                self.pc = self._execute_jz(instruction.operands)
-            elif instruction.type == InstructionType.JNZ:
-                self.pc = self._execute_jnz(instruction.operands)
-            elif instruction.type == InstructionType.PRINT_CACHE:
-                self._print_cache_state()
-            elif instruction.type == InstructionType.PRINT_REG:
-                self._print_register_state()
-            elif instruction.type == InstructionType.HALT:
+            if instruction.type is InstructionType.HALT:
                 self.running = False
                 return False
-            else:
+
+            handler = self._dispatch.get(instruction.type)
+            if handler is None:
                 raise ValueError(f"Unknown instruction: {instruction.type}")
+            if instruction.error is not None:
+                raise instruction.error
+            next_pc = handler(instruction.args)
+            if next_pc is not None:
+                self.pc = next_pc
+            if instruction.prefetch_stride and self.prefetch_lookahead and self._prefetch is not None:
+                reg = instruction.args[1][1]
+                self._prefetch(self.registers.get(reg, 0) + instruction.prefetch_stride * self.prefetch_lookahead)
 
             return True
 
@@ -182,26 +303,86 @@ class SimpleISA:
             self.running = False
             return False
 
-    def _execute_mov(self, operands: List[str]) -> None:
+    def step(self) -> Dict:
+        """Execute one instruction and return a delta describing what it changed (see step_many())"""
+        return self.step_many(1)
+
+    def step_many(self, count: int) -> Dict:
+        """Execute up to count instructions, stopping early if the program stops, and return
+        one delta describing what they changed together
+
+        The delta has the form:
+            {'running': bool,
+             'steps': int,                           # instructions attempted
+             'regs': {name: value},                 # registers whose value changed
+             'l1_blocks': {set: [(tag, data), ...]}, # L1 sets whose contents changed
+             'l2_blocks': {set: [(tag, data), ...]}, # L2 sets whose contents changed
+             'l1_stats': bool,                       # L1 was accessed (hit/miss counts changed)
+             'l2_stats': bool}                       # L2 was accessed (hit/miss counts changed)
+        """
+        l2_cache = self.cache.next_level if self.cache and isinstance(self.cache.next_level, Cache) else None
+        l1_accesses = self.cache.get_access_count() if self.cache else 0
+        l2_accesses = l2_cache.get_access_count() if l2_cache else 0
+        before = dict(self.registers)
+
+        # Bind the step method once rather than looking it up for every instruction
+        execute_step = self.execute_step
+        steps = 0
+        running = True
+        while running and steps < count:
+            running = execute_step()
+            steps += 1
+
+        delta = {
+            'running': running,
+            'steps': steps,
+            'regs': {reg: value for reg, value in self.registers.items() if before.get(reg) != value},
+            'l1_blocks': {},
+            'l2_blocks': {},
+            'l1_stats': False,
+            'l2_stats': False
+        }
+        if self.cache:
+            delta['l1_blocks'] = self.cache.collect_changes()
+            delta['l1_stats'] = self.cache.get_access_count() != l1_accesses
+            if l2_cache:
+                delta['l2_blocks'] = l2_cache.collect_changes()
+                delta['l2_stats'] = l2_cache.get_access_count() != l2_accesses
+        return delta
+
+    def _address(self, operand: Operand) -> int:
+        """Return the address a decoded memory operand refers to"""
+        kind, value, _ = operand
+        if kind == OPERAND_MEM:
+            return value
+        return self.registers.get(value, 0)
+
+    def _write_memory(self, addr: int, value: int) -> None:
+        """Write an address to the cache if there is one, and through to memory"""
+        if self._cache_write is not None:
+            self._cache_write(addr, value)
+        self._mem_write(addr, value)
+
+    def _execute_mov(self, args: Tuple[Operand, ...]) -> None:
         """Execute MOV instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("MOV requires 2 operands")
 
-        dest, src = operands
+        (dest_kind, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
+        if src_kind == OPERAND_IMM:
+            value = src_value
             # Log register operation with enhanced visualization
             self.logger.log_register_operation('mov', {
                 'dest': dest,
                 'value': value,
                 'source': 'immediate'
             })
-        elif src.startswith('['):
+        elif src_kind >= OPERAND_MEM:
             # Memory access
-            addr = self._evaluate_address(src[1:-1])
-            value = self.cache.read(addr) if self.cache else self.memory.read(addr)
+            addr = self._address(args[1])
+            value = self._read(addr)
             # Log register operation with enhanced visualization
             self.logger.log_register_operation('mov', {
                 'dest': dest,
@@ -218,56 +399,51 @@ class SimpleISA:
             })
 
         # Store in destination
-        if dest.startswith('['):
+        if dest_kind >= OPERAND_MEM:
             # Memory write
-            addr = self._evaluate_address(dest[1:-1])
-            if self.cache:
-                self.cache.write(addr, value)
-                # Ensure write-through to memory
-                self.memory.write(addr, value)
-            else:
-                self.memory.write(addr, value)
+            # Ensure write-through to memory
+            self._write_memory(self._address(args[0]), value)
         else:
             self.registers[dest] = value
 
-    def _execute_add(self, operands: List[str]) -> None:
+    def _execute_add(self, args: Tuple[Operand, ...]) -> None:
         """Execute ADD instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("ADD requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
+        if src_kind == OPERAND_IMM:
+            value = src_value
         else:
             value = self.registers.get(src, 0)
 
         # Add to destination
         self.registers[dest] += value
 
-    def _execute_sub(self, operands: List[str]) -> None:
+    def _execute_sub(self, args: Tuple[Operand, ...]) -> None:
         """Execute SUB instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("SUB requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
+        if src_kind == OPERAND_IMM:
+            value = src_value
         else:
             value = self.registers.get(src, 0)
 
         # Subtract from destination
         self.registers[dest] -= value
 
-    def _execute_inc(self, operands: List[str]) -> None:
+    def _execute_inc(self, args: Tuple[Operand, ...]) -> None:
         """Execute INC instruction - increment register by 1"""
-        if len(operands) != 1:
-            raise ValueError(f"INC instruction requires 1 operand, got {len(operands)}")
+        if len(args) != 1:
+            raise ValueError(f"INC instruction requires 1 operand, got {len(args)}")
 
-        dest = operands[0]
+        dest = args[0][2]
         if dest not in self.registers:
             raise ValueError(f"Invalid register {dest}")
 
@@ -278,12 +454,12 @@ class SimpleISA:
             'source': 'increment'
         })
 
-    def _execute_dec(self, operands: List[str]) -> None:
+    def _execute_dec(self, args: Tuple[Operand, ...]) -> None:
         """Execute DEC instruction - decrement register by 1"""
-        if len(operands) != 1:
-            raise ValueError(f"DEC instruction requires 1 operand, got {len(operands)}")
+        if len(args) != 1:
+            raise ValueError(f"DEC instruction requires 1 operand, got {len(args)}")
 
-        dest = operands[0]
+        dest = args[0][2]
         if dest not in self.registers:
             raise ValueError(f"Invalid register {dest}")
 
@@ -294,12 +470,12 @@ class SimpleISA:
             'source': 'decrement'
         })
 
-    def _execute_not(self, operands: List[str]) -> None:
+    def _execute_not(self, args: Tuple[Operand, ...]) -> None:
         """Execute NOT instruction"""
-        if len(operands) != 1:
+        if len(args) != 1:
             raise ValueError("NOT requires 1 operand")
 
-        reg = operands[0]
+        reg = args[0][2]
         if reg not in self.registers:
             raise ValueError(f"Invalid register: {reg}")
 
@@ -312,22 +488,21 @@ class SimpleISA:
             'result': self.registers[reg]
         })
 
-    def _execute_and(self, operands: List[str]) -> None:
+    def _execute_and(self, args: Tuple[Operand, ...]) -> None:
         """Execute AND instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("AND requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
         if dest not in self.registers:
             raise ValueError(f"Invalid destination register: {dest}")
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
-        elif src.startswith('['):
+        if src_kind == OPERAND_IMM:
+            value = src_value
+        elif src_kind >= OPERAND_MEM:
             # Memory access
-            addr = self._evaluate_address(src[1:-1])
-            value = self.cache.read(addr) if self.cache else self.memory.read(addr)
+            value = self._read(self._address(args[1]))
         else:
             value = self.registers.get(src, 0)
 
@@ -341,22 +516,20 @@ class SimpleISA:
             'result': self.registers[dest]
         })
 
-    def _execute_or(self, operands: List[str]) -> None:
+    def _execute_or(self, args: Tuple[Operand, ...]) -> None:
         """Execute OR instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("OR requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
         if not dest in self.registers:
             raise ValueError(f"Invalid destination register: {dest}")
 
-        # Get source value
-        if src.startswith('#'):
-            src_value = int(src[1:])
-        elif src in self.registers:
+        # Get source value; an immediate is already decoded
+        if src_kind != OPERAND_IMM:
+            if src not in self.registers:
+                raise ValueError(f"Invalid source operand: {src}")
             src_value = self.registers[src]
-        else:
-            raise ValueError(f"Invalid source operand: {src}")
 
         # Perform bitwise OR
         result = self.registers[dest] | src_value
@@ -371,33 +544,30 @@ class SimpleISA:
             'source': src
         })
 
-    def _execute_xor(self, operands: List[str]) -> None:
+    def _execute_xor(self, args: Tuple[Operand, ...]) -> None:
         """Execute XOR instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("XOR requires 2 operands")
 
-        dest, src = operands
+        (dest_kind, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            src_val = int(src[1:])
-        elif src.startswith('['):
-            addr = self._evaluate_address(src[1:-1])
-            src_val = self.cache.read(addr) if self.cache else self.memory.read(addr)
+        if src_kind == OPERAND_IMM:
+            src_val = src_value
+        elif src_kind >= OPERAND_MEM:
+            src_val = self._read(self._address(args[1]))
         else:
             if src not in self.registers:
                 raise ValueError(f"Invalid source register: {src}")
             src_val = self.registers[src]
 
         # Get destination value and perform XOR
-        if dest.startswith('['):
+        if dest_kind >= OPERAND_MEM:
             # Memory operation
-            addr = self._evaluate_address(dest[1:-1])
-            dest_val = self.cache.read(addr) if self.cache else self.memory.read(addr)
+            addr = self._address(args[0])
+            dest_val = self._read(addr)
             result = dest_val ^ src_val
-            if self.cache:
-                self.cache.write(addr, result)
-            self.memory.write(addr, result)
+            self._write_memory(addr, result)
             self.logger.log_register_operation('xor', {
                 'dest': f"Memory[{addr}]",
                 'value': result,
@@ -416,33 +586,30 @@ class SimpleISA:
                 'source': src
             })
 
-    def _execute_shift(self, operands: List[str], left: bool) -> None:
+    def _execute_shift(self, args: Tuple[Operand, ...], left: bool) -> None:
         """Execute SHL or SHR instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("Shift requires 2 operands")
 
-        dest, src = operands
+        (dest_kind, _, dest), (src_kind, src_value, src) = args
 
         # Get shift amount
-        if src.startswith('#'):
-            shift_amount = int(src[1:])
-        elif src.startswith('['):
-            addr = self._evaluate_address(src[1:-1])
-            shift_amount = self.cache.read(addr) if self.cache else self.memory.read(addr)
+        if src_kind == OPERAND_IMM:
+            shift_amount = src_value
+        elif src_kind >= OPERAND_MEM:
+            shift_amount = self._read(self._address(args[1]))
         else:
             if src not in self.registers:
                 raise ValueError(f"Invalid source register: {src}")
             shift_amount = self.registers[src]
 
         # Perform shift operation
-        if dest.startswith('['):
+        if dest_kind >= OPERAND_MEM:
             # Memory operation
-            addr = self._evaluate_address(dest[1:-1])
-            dest_val = self.cache.read(addr) if self.cache else self.memory.read(addr)
+            addr = self._address(args[0])
+            dest_val = self._read(addr)
             result = dest_val << shift_amount if left else dest_val >> shift_amount
-            if self.cache:
-                self.cache.write(addr, result)
-            self.memory.write(addr, result)
+            self._write_memory(addr, result)
             self.logger.log_register_operation('shift', {
                 'dest': f"Memory[{addr}]",
                 'value': result,
@@ -463,23 +630,31 @@ class SimpleISA:
                 'left': left
             })
 
-    def _execute_jmp(self, operands: List[str]) -> int:
+    def _execute_shl(self, args: Tuple[Operand, ...]) -> None:
+        """Execute SHL instruction"""
+        self._execute_shift(args, True)
+
+    def _execute_shr(self, args: Tuple[Operand, ...]) -> None:
+        """Execute SHR instruction"""
+        self._execute_shift(args, False)
+
+    def _execute_jmp(self, args: Tuple[Operand, ...]) -> int:
         """Execute JMP instruction"""
-        if len(operands) != 1:
+        if len(args) != 1:
             raise ValueError("JMP requires 1 operand")
 
-        label = operands[0]
+        label = args[0][2]
         if label not in self.labels:
             raise ValueError(f"Undefined label: {label}")
 
         return self.labels[label]
 
-    def _execute_jz(self, operands: List[str]) -> int:
+    def _execute_jz(self, args: Tuple[Operand, ...]) -> int:
         """Execute JZ instruction"""
-        if len(operands) != 1:
+        if len(args) != 1:
             raise ValueError("JZ requires 1 operand")
 
-        label = operands[0]
+        label = args[0][2]
         if label not in self.labels:
             raise ValueError(f"Unknown label: {label}")
 
@@ -487,12 +662,12 @@ class SimpleISA:
             return self.labels[label]
         return self.pc + 1
 
-    def _execute_jnz(self, operands: List[str]) -> int:
+    def _execute_jnz(self, args: Tuple[Operand, ...]) -> int:
         """Execute JNZ instruction"""
-        if len(operands) != 1:
+        if len(args) != 1:
             raise ValueError("JNZ requires 1 operand")
 
-        label = operands[0]
+        label = args[0][2]
         if label not in self.labels:
             raise ValueError(f"Unknown label: {label}")
 
@@ -500,21 +675,21 @@ class SimpleISA:
             return self.labels[label]
         return self.pc
 
-    def _execute_load(self, operands: List[str]) -> None:
+    def _execute_load(self, args: Tuple[Operand, ...]) -> None:
         """Execute LOAD instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("LOAD requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, _, _) = args
 
         # Get memory address
-        if src.startswith('['):
-            addr = self._evaluate_address(src[1:-1])
+        if src_kind >= OPERAND_MEM:
+            addr = self._address(args[1])
         else:
             raise ValueError("LOAD source must be a memory address")
 
         # Read from memory and store in register
-        value = self.cache.read(addr) if self.cache else self.memory.read(addr)
+        value = self._read(addr)
         self.registers[dest] = value
 
         # Log register operation with enhanced visualization
@@ -524,26 +699,22 @@ class SimpleISA:
             'source': f'memory[{addr}]'
         })
 
-    def _execute_store(self, operands: List[str]) -> None:
+    def _execute_store(self, args: Tuple[Operand, ...]) -> None:
         """Execute STORE instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("STORE requires 2 operands")
 
-        dest, src = operands
+        (dest_kind, _, dest), (src_kind, _, src) = args
 
         # Get source value
-        if src.startswith('['):
-            addr = self._evaluate_address(src[1:-1])
-            value = self.cache.read(addr) if self.cache else self.memory.read(addr)
+        if src_kind >= OPERAND_MEM:
+            value = self._read(self._address(args[1]))
         else:
             value = self.registers.get(src, 0)
 
         # Store in memory
-        if dest.startswith('['):
-            addr = self._evaluate_address(dest[1:-1])
-            if self.cache:
-                self.cache.write(addr, value)
-            self.memory.write(addr, value)
+        if dest_kind >= OPERAND_MEM:
+            self._write_memory(self._address(args[0]), value)
         else:
             self.registers[dest] = value
 
@@ -554,16 +725,16 @@ class SimpleISA:
             'source': src
         })
 
-    def _execute_cmp(self, operands: List[str]) -> None:
+    def _execute_cmp(self, args: Tuple[Operand, ...]) -> None:
         """Execute CMP instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("CMP requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
+        if src_kind == OPERAND_IMM:
+            value = src_value
         else:
             value = self.registers.get(src, 0)
 
@@ -572,22 +743,30 @@ class SimpleISA:
         dest_val = self.registers.get(dest, 0)
         self.registers['eax'] = 1 if dest_val < value else 0
 
-    def _execute_test(self, operands: List[str]) -> None:
+    def _execute_test(self, args: Tuple[Operand, ...]) -> None:
         """Execute TEST instruction"""
-        if len(operands) != 2:
+        if len(args) != 2:
             raise ValueError("TEST requires 2 operands")
 
-        dest, src = operands
+        (_, _, dest), (src_kind, src_value, src) = args
 
         # Get source value
-        if src.startswith('#'):
-            value = int(src[1:])
+        if src_kind == OPERAND_IMM:
+            value = src_value
         else:
             value = self.registers.get(src, 0)
 
         # Test bits (AND without storing)
         self.registers[dest] = 1 if self.registers[dest] & value else 0
 
+    def _execute_print_cache(self, args: Tuple[Operand, ...]) -> None:
+        """Execute PRINT_CACHE instruction"""
+        self._print_cache_state()
+
+    def _execute_print_reg(self, args: Tuple[Operand, ...]) -> None:
+        """Execute PRINT_REG instruction"""
+        self._print_register_state()
+
     def _print_cache_state(self):
         """Print detailed cache state information"""
         print("\n=== CACHE STATE ===")
@@ -616,8 +795,8 @@ class SimpleISA:
             print(f"Hit Rate: {l1_stats['hit_rate']:.2f}%")
 
             # Print L2 Cache State
-            if self.cache._next_level:
-                l2_state = self.cache._next_level.get_cache_state()
+            if self.cache.next_level:
+                l2_state = self.cache.next_level.get_cache_state()
                 print("\nL2 Cache Contents:")
                 print("Set\tWay\tTag\tData")
                 print("-" * 30)
@@ -632,7 +811,7 @@ class SimpleISA:
                         print(f"{set_idx}\t-\t-\tEmpty")
 
                 # Print L2 Cache Stats
-                l2_stats = self.cache._next_level.get_performance_stats()
+                l2_stats = self.cache.next_level.get_performance_stats()
                 print(f"\nL2 Cache Stats:")
                 print(f"Hits: {l2_stats['hits']}")
                 print(f"Misses: {l2_stats['misses']}")
@@ -647,13 +826,6 @@ class SimpleISA:
             print(f"{reg}: {value}")
         print("=== END REGISTER STATE ===\n")
 
-    def _evaluate_address(self, expr: str) -> int:
-        """Evaluate a memory address expression"""
-        # Simple address evaluation - can be extended for more complex expressions
-        if expr.isdigit():
-            return int(expr)
-        return self.registers.get(expr, 0)
-
     def _print_state(self) -> None:
         """Print the current state of the CPU and memory"""
         print("\nCPU State:")
@@ -677,14 +849,15 @@ class SimpleISA:
     def run(self) -> None:
         """Run the loaded program"""
         self.running = True
-        self.start_time = time()
+        self.start_time = perf_counter()
         self.instruction_count = 0
 
+        execute_step = self.execute_step
         while self.running:
-            if not self.execute_step():
+            if not execute_step():
                 break
 
-        self.end_time = time()
+        self.end_time = perf_counter()
         exec_time = self.end_time - self.start_time
         ips = self.instruction_count / exec_time if exec_time > 0 else 0
 
@@ -1,4 +1,3 @@
-from time import sleep, time
 from colorama import Fore, Style
 from utils.logger import Logger, LogLevel
 
@@ -30,10 +29,12 @@ class Memory():
         self._reads = 0
         self._writes = 0
 
+    @property
+    def size(self):
+        return self._size
+
     def read(self, address, output=True):
         """Read a value from memory"""
-        start_time = time()
-
         if not self._validate_address(address):
             raise ValueError(f"Invalid memory address: {address}")
 
@@ -77,8 +78,6 @@ class Memory():
             output: Whether to output debug information
             propagate: Ignored parameter for compatibility with cache interface
         """
-        start_time = time()
-
         if not self._validate_address(address):
             raise ValueError(f"Invalid memory address: {address}")
 
@@ -117,6 +116,37 @@ class Memory():
 
         return True
 
+    def bulk_write(self, start_address, values, stride=1):
+        """Store values at start_address, start_address + stride, ... in one slice assignment
+
+        Meant for seeding memory before a run: no access statistics or log entries are recorded.
+        """
+        if not isinstance(stride, int) or stride < 1:
+            raise ValueError(f"Invalid stride: {stride}")
+        values = [int(value) for value in values]
+        end_address = start_address + stride * (len(values) - 1)
+        if values and not (self._validate_address(start_address) and self._validate_address(end_address)):
+            raise ValueError(f"Invalid memory range: {start_address} to {end_address}")
+        self._data[start_address:end_address + 1:stride] = values
+
+    def peek(self, address):
+        """Return the value at an address without recording an access
+
+        Meant for displaying memory: unlike read() it leaves statistics, access patterns and
+        the log untouched.
+        """
+        if not self._validate_address(address):
+            raise ValueError(f"Invalid memory address: {address}")
+        return int(self._data[address])
+
+    def used_mask(self):
+        """Return one byte per address, 1 where the address holds a nonzero value
+
+        Uses the same notion of used memory as analyze_memory_usage(), without recording an
+        access.
+        """
+        return bytes(map(bool, self._data))
+
     def _validate_address(self, address):
         """Validate a memory address"""
         if not isinstance(address, int):
@@ -304,8 +334,12 @@ class MainMemory(Memory):
         return value
 
     # Write data to main memory address
-    def write(self, address, data):
-        """Write a value to main memory"""
+    def write(self, address, data, output=True, propagate=None):
+        """Write a value to main memory
+
+        output and propagate are accepted for compatibility with Memory.write(), so a cache can
+        write back to either; main memory does not log its accesses.
+        """
         if not self._validate_address(address):
             raise ValueError(f"Invalid memory address: {address}")
 